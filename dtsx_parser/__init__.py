@@ -23,6 +23,8 @@ Usage:
     report = report_gen.generate_full_report('markdown')
 """
 
+import importlib
+
 from .models import (
     DtsxPackage,
     PackageMetadata,
@@ -30,6 +32,7 @@ from .models import (
     Variable,
     Parameter,
     ControlFlowStage,
+    TaskInfo,
     DataFlowTask,
     DataFlowComponent,
     DataFlowPath,
@@ -42,8 +45,24 @@ from .models import (
 )
 
 from .parser import DtsxParser
-from .diagram_generator import DiagramGenerator
-from .report_generator import ReportGenerator
+
+# Report and diagram generators are imported on first access (PEP 562) so
+# that parsing-only callers do not load the rendering machinery
+_LAZY_ATTRS = {
+    'DiagramGenerator': '.diagram_generator',
+    'ReportGenerator': '.report_generator',
+}
+
+
+def __getattr__(name):
+    """Import the report and diagram generators lazily."""
+    module = _LAZY_ATTRS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
 
 __version__ = '1.0.0'
 __author__ = 'DTSX Parser'
@@ -58,6 +77,7 @@ __all__ = [
     'Variable',
     'Parameter',
     'ControlFlowStage',
+    'TaskInfo',
     'DataFlowTask',
     'DataFlowComponent',
     'DataFlowPath',
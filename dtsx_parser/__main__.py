@@ -15,11 +15,10 @@ Examples:
 
 import argparse
 import sys
+import xml.etree.ElementTree as ET
 from pathlib import Path
 
 from .parser import DtsxParser
-from .report_generator import ReportGenerator
-from .diagram_generator import DiagramGenerator
 
 
 def main():
@@ -76,12 +75,24 @@ Examples:
         help='Output Mermaid diagram code'
     )
 
+    parser.add_argument(
+        '--pretty',
+        action='store_true',
+        help='Indent JSON output for reading (default: compact)'
+    )
+
     parser.add_argument(
         '--summary',
         action='store_true',
         help='Show only package summary'
     )
 
+    parser.add_argument(
+        '-j', '--workers',
+        type=int,
+        help='Parse large packages in this many worker processes'
+    )
+
     parser.add_argument(
         '-v', '--verbose',
         action='store_true',
@@ -110,7 +121,7 @@ Examples:
         if args.verbose:
             print(f"Parsing: {dtsx_path}", file=sys.stderr)
 
-        dtsx_parser = DtsxParser(str(dtsx_path))
+        dtsx_parser = DtsxParser(str(dtsx_path), max_workers=args.workers)
         package = dtsx_parser.parse()
 
         if args.verbose:
@@ -124,30 +135,34 @@ Examples:
         if args.summary:
             print_summary(package)
         elif args.diagrams_only:
+            from .diagram_generator import DiagramGenerator
             diagram_gen = DiagramGenerator(package)
+            parts = []
             if args.mermaid:
-                diagrams = diagram_gen.generate_all_diagrams()
-                for diagram in diagrams:
-                    print(f"\n### {diagram.name}\n")
-                    print(diagram.mermaid_code)
+                for diagram in diagram_gen.iter_diagrams():
+                    parts.append(f"\n### {diagram.name}\n")
+                    parts.append(diagram.mermaid_code)
             else:
-                print(diagram_gen._generate_ascii_control_flow())
+                parts.append(diagram_gen._generate_ascii_control_flow())
                 for dft in package.data_flow_tasks:
-                    print(diagram_gen._generate_ascii_data_flow(dft))
-                print(diagram_gen.generate_execution_order_diagram())
-                print(diagram_gen.generate_routing_logic_diagram())
+                    parts.append(diagram_gen._generate_ascii_data_flow(dft))
+                parts.append(diagram_gen.generate_execution_order_diagram())
+                parts.append(diagram_gen.generate_routing_logic_diagram())
+            _write_lines(parts)
         elif args.all_formats:
+            from .report_generator import ReportGenerator
             report_gen = ReportGenerator(package)
             output_dir = args.output_dir or '.'
-            report_gen.save_all_formats(output_dir)
+            report_gen.save_all_formats(output_dir, args.pretty)
         else:
+            from .report_generator import ReportGenerator
             report_gen = ReportGenerator(package)
 
             if args.output:
-                report_gen.save_report(args.output, args.format)
+                report_gen.save_report(args.output, args.format, args.pretty)
             else:
-                report = report_gen.generate_full_report(args.format)
-                print(report)
+                # Render the whole report first so a failure prints no partial output
+                _write_lines([report_gen.generate_full_report(args.format, args.pretty)])
 
     except ET.ParseError as e:
         print(f"Error parsing XML: {e}", file=sys.stderr)
@@ -162,52 +177,58 @@ Examples:
 
 def print_summary(package):
     """Print a brief package summary."""
-    print("=" * 60)
-    print(f" PACKAGE SUMMARY: {package.metadata.name}")
-    print("=" * 60)
-    print()
-    print(f"  Created:     {package.metadata.creation_date or 'N/A'}")
-    print(f"  Creator:     {package.metadata.creator_name or 'N/A'}")
-    print(f"  Version:     {package.metadata.version_build or 'N/A'}")
-    print()
-    print("  COMPONENTS:")
-    print(f"    Connection Managers:  {len(package.connection_managers)}")
-    print(f"    Variables:            {len(package.variables)}")
-    print(f"    Parameters:           {len(package.parameters)}")
-    print(f"    Control Flow Stages:  {len(package.control_flow_stages)}")
-    print(f"    Data Flow Tasks:      {len(package.data_flow_tasks)}")
-    print(f"    Database Objects:     {len(package.database_objects)}")
-    print(f"    Thresholds:           {len(package.thresholds)}")
-    print(f"    Alerts:               {len(package.alerts)}")
-    print()
+    lines = []
+    lines.append("=" * 60)
+    lines.append(f" PACKAGE SUMMARY: {package.metadata.name}")
+    lines.append("=" * 60)
+    lines.append("")
+    lines.append(f"  Created:     {package.metadata.creation_date or 'N/A'}")
+    lines.append(f"  Creator:     {package.metadata.creator_name or 'N/A'}")
+    lines.append(f"  Version:     {package.metadata.version_build or 'N/A'}")
+    lines.append("")
+    lines.append("  COMPONENTS:")
+    lines.append(f"    Connection Managers:  {len(package.connection_managers)}")
+    lines.append(f"    Variables:            {len(package.variables)}")
+    lines.append(f"    Parameters:           {len(package.parameters)}")
+    lines.append(f"    Control Flow Stages:  {len(package.control_flow_stages)}")
+    lines.append(f"    Data Flow Tasks:      {len(package.data_flow_tasks)}")
+    lines.append(f"    Database Objects:     {len(package.database_objects)}")
+    lines.append(f"    Thresholds:           {len(package.thresholds)}")
+    lines.append(f"    Alerts:               {len(package.alerts)}")
+    lines.append("")
 
     if package.control_flow_stages:
-        print("  CONTROL FLOW STAGES:")
+        lines.append("  CONTROL FLOW STAGES:")
         for stage in package.control_flow_stages:
             cond = f" [Conditional]" if stage.condition else ""
-            print(f"    {stage.order}. {stage.name} ({stage.stage_type}){cond}")
-        print()
+            lines.append(f"    {stage.order}. {stage.name} ({stage.stage_type}){cond}")
+        lines.append("")
 
     if package.data_flow_tasks:
-        print("  DATA FLOW TASKS:")
+        lines.append("  DATA FLOW TASKS:")
         for dft in package.data_flow_tasks:
-            sources = len([c for c in dft.components if c.component_type == 'Source'])
-            transforms = len([c for c in dft.components if c.component_type == 'Transform'])
-            dests = len([c for c in dft.components if c.component_type == 'Destination'])
-            print(f"    - {dft.name}")
-            print(f"      Sources: {sources}, Transforms: {transforms}, Destinations: {dests}")
-        print()
+            by_type = dft.components_by_type()
+            sources = len(by_type.get('Source', []))
+            transforms = len(by_type.get('Transform', []))
+            dests = len(by_type.get('Destination', []))
+            lines.append(f"    - {dft.name}")
+            lines.append(f"      Sources: {sources}, Transforms: {transforms}, Destinations: {dests}")
+        lines.append("")
 
     if package.connection_managers:
-        print("  CONNECTIONS:")
+        lines.append("  CONNECTIONS:")
         for conn in package.connection_managers:
             db = f" -> {conn.database}" if conn.database else ""
-            print(f"    - {conn.name} ({conn.connection_type}){db}")
-        print()
+            lines.append(f"    - {conn.name} ({conn.connection_type}){db}")
+        lines.append("")
 
+    _write_lines(lines)
 
-# Import ET for exception handling
-import xml.etree.ElementTree as ET
+
+def _write_lines(lines):
+    """Write lines to stdout with a single buffered write."""
+    sys.stdout.write('\n'.join(lines) + '\n')
+    sys.stdout.flush()
 
 
 if __name__ == '__main__':
@@ -5,12 +5,132 @@ Generates visual representations of data flows and control flows
 using Mermaid.js syntax and ASCII art.
 """
 
-from typing import List, Dict, Optional
+import re
+from itertools import islice
+from typing import Iterator, List, Dict, Optional, Tuple
 from .models import (
     DtsxPackage, DataFlowTask, DataFlowComponent, DataFlowPath,
-    ControlFlowStage, DataFlowDiagram
+    ControlFlowStage, DataFlowDiagram, sql_preview
 )
 
+# (by full ref_id, by ref_id tail or component name) -> component name
+ComponentIndex = Tuple[Dict[str, str], Dict[str, str]]
+
+
+# Translation table for Mermaid node IDs: space, dash and dot become
+# underscores; any other ASCII character that is not alphanumeric is dropped.
+_SANITIZE_TABLE = str.maketrans({
+    chr(i): ('_' if chr(i) in ' -.' else None)
+    for i in range(128)
+    if chr(i) in ' -.' or not (chr(i).isalnum() or chr(i) == '_')
+})
+
+# Variable reference markup and doubled equals in precedence expressions
+_CONDITION_RE = re.compile(r'@\[User::|\]|==')
+_CONDITION_REFS_RE = re.compile(r'@\[User::|\]')
+
+
+def _clean_condition(expression: str, collapse_equals: bool = True) -> str:
+    """Strip @[User::...] markup from an expression for display."""
+    if collapse_equals:
+        return _CONDITION_RE.sub(lambda m: '=' if m.group(0) == '==' else '', expression)
+    return _CONDITION_REFS_RE.sub('', expression)
+
+
+# Fixed styling block emitted after the edges of every Mermaid flowchart
+_MERMAID_CLASS_DEFS = (
+    "\n"
+    "    %% Styling\n"
+    "    classDef source fill:#e1f5fe,stroke:#01579b\n"
+    "    classDef destination fill:#e8f5e9,stroke:#1b5e20\n"
+    "    classDef transform fill:#fff3e0,stroke:#e65100"
+)
+
+
+def _node_style(comp_type: str) -> Optional[str]:
+    """Map a component type to its Mermaid class name."""
+    if comp_type == 'Source':
+        return 'source'
+    if comp_type == 'Destination':
+        return 'destination'
+    if 'Transform' in comp_type:
+        return 'transform'
+    return None
+
+
+# Fixed ASCII diagram blocks, filled with a task or component name where
+# they take one. Each is a single entry in a diagram's line list.
+_ASCII_CONTROL_FLOW_HEADER = (
+    f"{'=' * 60}\n"
+    " CONTROL FLOW DIAGRAM\n"
+    f"{'=' * 60}\n"
+)
+_ASCII_DATA_FLOW_HEADER = (
+    f"{'=' * 70}\n"
+    " DATA FLOW: %s\n"
+    f"{'=' * 70}\n"
+)
+_ASCII_DOWN_ARROW = (
+    "        |\n"
+    "        V"
+)
+_ASCII_DATA_PATHS_HEADER = (
+    f"{'-' * 70}\n"
+    "DATA PATHS:"
+)
+_ASCII_EXECUTION_ORDER_HEADER = (
+    f"{'=' * 60}\n"
+    " EXECUTION ORDER\n"
+    f"{'=' * 60}\n"
+)
+_ASCII_ROUTING_LOGIC_HEADER = (
+    f"{'=' * 70}\n"
+    " DATA ROUTING LOGIC\n"
+    f"{'=' * 70}\n"
+)
+_ASCII_DATA_FLOW_TITLE = (
+    "Data Flow: %s\n"
+    f"{'-' * 50}\n"
+)
+_ASCII_LOOKUP_ROUTING = (
+    "  Lookup: %s\n"
+    "    Match Output: Rows with matching reference data\n"
+    "    No Match Output: Rows without matching reference data"
+)
+
+
+# ASCII symbols for transforms, keyed by the component class name
+# (e.g. Microsoft.DerivedColumn -> DerivedColumn)
+_TRANSFORM_SYMBOLS = {
+    'DerivedColumn': "{DER}",
+    'ConditionalSplit': "{SPLIT}",
+    'Lookup': "{LKP}",
+    'Multicast': "{MCT}",
+    'RowCount': "{RC}",
+    'DataConvert': "{DCV}",
+}
+
+
+def _transform_symbol(component_class: str) -> str:
+    """Get the ASCII diagram symbol for a transform component class."""
+    symbol = _TRANSFORM_SYMBOLS.get(component_class.rpartition('.')[2])
+    if symbol is not None:
+        return symbol
+    # Fall back to substring matching for non-canonical class IDs
+    for key, symbol in _TRANSFORM_SYMBOLS.items():
+        if key in component_class:
+            return symbol
+    return "{TRF}"
+
+
+# Node definition templates by Mermaid class, filled with (node id, label)
+_NODE_TEMPLATES = {
+    'source': '        %s[("%s")]',       # Cylinder for source
+    'destination': '        %s[["%s"]]',  # Subroutine shape for dest
+    'transform': '        %s{"%s"}',      # Diamond for transform
+    None: '        %s["%s"]',             # Default rectangle
+}
+
 
 class DiagramGenerator:
     """Generates diagrams for DTSX package visualization."""
@@ -18,102 +138,130 @@ class DiagramGenerator:
     def __init__(self, package: DtsxPackage):
         """Initialize with a parsed DTSX package."""
         self.package = package
+        # Generated diagrams are cached so report and CLI paths share them.
+        # Data flow tasks are keyed by identity: ref_id may be empty or repeated.
+        self._control_flow_diagram: Optional[DataFlowDiagram] = None
+        self._data_flow_diagrams: Dict[int, DataFlowDiagram] = {}
+        self._ascii_control_flow: Optional[str] = None
+        self._components_by_dft: Dict[int, Dict[str, List[DataFlowComponent]]] = {}
+
+    def components_by_type(self, dft: DataFlowTask) -> Dict[str, List[DataFlowComponent]]:
+        """Components of a data flow task grouped by type, built once per task."""
+        buckets = self._components_by_dft.get(id(dft))
+        if buckets is None:
+            buckets = self._components_by_dft[id(dft)] = dft.components_by_type()
+        return buckets
 
     def generate_all_diagrams(self) -> List[DataFlowDiagram]:
         """Generate all diagrams for the package."""
-        diagrams = []
+        return list(self.iter_diagrams())
 
-        # Generate control flow diagram
-        cf_diagram = self.generate_control_flow_diagram()
-        diagrams.append(cf_diagram)
-
-        # Generate data flow diagrams for each DFT
+    def iter_diagrams(self) -> Iterator[DataFlowDiagram]:
+        """Yield the control flow diagram, then one diagram per data flow task."""
+        yield self.generate_control_flow_diagram()
         for dft in self.package.data_flow_tasks:
-            df_diagram = self.generate_data_flow_diagram(dft)
-            diagrams.append(df_diagram)
-
-        return diagrams
+            yield self.generate_data_flow_diagram(dft)
 
     def generate_control_flow_diagram(self) -> DataFlowDiagram:
         """Generate a control flow diagram."""
+        if self._control_flow_diagram is not None:
+            return self._control_flow_diagram
+
         components = [stage.name for stage in self.package.control_flow_stages]
         paths = []
 
+        # Resolve each distinct ref_id to its stage name once
+        constraints = self.package.raw_precedence_constraints
+        stage_names = {}
+        for constraint in constraints:
+            for ref in (constraint.from_ref, constraint.to_ref):
+                if ref not in stage_names:
+                    stage_names[ref] = self._extract_stage_name(ref)
+
         # Build paths from precedence constraints
-        for constraint in self.package.raw_precedence_constraints:
-            from_name = self._extract_stage_name(constraint.from_ref)
-            to_name = self._extract_stage_name(constraint.to_ref)
+        for constraint in constraints:
+            from_name = stage_names[constraint.from_ref]
+            to_name = stage_names[constraint.to_ref]
             label = ""
             if constraint.expression:
-                label = constraint.expression.replace('@[User::', '').replace(']', '').replace('==', '=')
+                label = _clean_condition(constraint.expression)
             paths.append((from_name, to_name, label))
 
-        mermaid = self._generate_mermaid_flowchart(
-            "Control Flow",
-            components,
-            paths,
-            direction="TB"
-        )
-
-        ascii_diagram = self._generate_ascii_control_flow()
-
-        return DataFlowDiagram(
+        self._control_flow_diagram = DataFlowDiagram(
             name="Control Flow",
             components=components,
             paths=paths,
-            mermaid_code=mermaid,
-            ascii_diagram=ascii_diagram
+            mermaid_renderer=lambda: self._generate_mermaid_flowchart(
+                "Control Flow",
+                components,
+                paths,
+                direction="TB"
+            ),
+            ascii_renderer=self._generate_ascii_control_flow
         )
+        return self._control_flow_diagram
 
     def generate_data_flow_diagram(self, dft: DataFlowTask) -> DataFlowDiagram:
         """Generate a data flow diagram for a specific data flow task."""
+        cached = self._data_flow_diagrams.get(id(dft))
+        if cached is not None:
+            return cached
+
         components = [comp.name for comp in dft.components]
         paths = []
 
-        # Build component lookup
-        comp_lookup = {comp.ref_id: comp.name for comp in dft.components}
-
-        # Also try to match by partial ref_id (output refs)
-        for comp in dft.components:
-            for suffix in ['.Outputs', '.Inputs']:
-                for variant in [f'{comp.ref_id}{suffix}', comp.ref_id]:
-                    comp_lookup[variant] = comp.name
-
         # Build paths
+        index = self._build_component_index(dft.components)
         for path in dft.paths:
             # Extract component names from path refs
-            source_name = self._extract_component_name(path.source_ref_id, dft.components)
-            dest_name = self._extract_component_name(path.destination_ref_id, dft.components)
+            source_name = self._extract_component_name(path.source_ref_id, dft.components, index)
+            dest_name = self._extract_component_name(path.destination_ref_id, dft.components, index)
 
             if source_name and dest_name:
                 paths.append((source_name, dest_name, path.name))
 
-        mermaid = self._generate_mermaid_flowchart(
-            dft.name,
-            components,
-            paths,
-            direction="TB",
-            component_types=self._get_component_types(dft)
-        )
-
-        ascii_diagram = self._generate_ascii_data_flow(dft)
-
-        return DataFlowDiagram(
+        diagram = DataFlowDiagram(
             name=dft.name,
             components=components,
             paths=paths,
-            mermaid_code=mermaid,
-            ascii_diagram=ascii_diagram
+            mermaid_renderer=lambda: self._generate_mermaid_flowchart(
+                dft.name,
+                components,
+                paths,
+                direction="TB",
+                component_types=self._get_component_types(dft)
+            ),
+            ascii_renderer=lambda: self._generate_ascii_data_flow(dft)
         )
+        self._data_flow_diagrams[id(dft)] = diagram
+        return diagram
 
     def _extract_stage_name(self, ref_id: str) -> str:
         """Extract stage name from ref_id."""
         # Format: Package\StageName
-        parts = ref_id.split('\\')
-        return parts[-1] if parts else ref_id
+        return ref_id.rpartition('\\')[2]
+
+    def _build_component_index(self, components: List[DataFlowComponent]) -> ComponentIndex:
+        """Index components by ref_id and by ref_id tail for path lookups."""
+        by_ref = {}
+        by_tail = {}
+        for comp in components:
+            by_ref.setdefault(comp.ref_id, comp.name)
+            by_tail.setdefault(comp.ref_id.rpartition('\\')[2], comp.name)
+            by_tail.setdefault(comp.name, comp.name)
+        return by_ref, by_tail
 
-    def _extract_component_name(self, ref_id: str, components: List[DataFlowComponent]) -> Optional[str]:
+    def _extract_component_name(self, ref_id: str, components: List[DataFlowComponent],
+                                index: Optional[ComponentIndex] = None) -> Optional[str]:
         """Extract component name from ref_id."""
+        if index is not None:
+            # Format: Package\Task\Component.Outputs[Output Name]
+            by_ref, by_tail = index
+            tail = ref_id.rpartition('\\')[2]
+            comp_part = tail.split('.', 1)[0]
+            name = by_ref.get(ref_id[:len(ref_id) - len(tail)] + comp_part) or by_tail.get(comp_part)
+            if name is not None:
+                return name
         for comp in components:
             if comp.ref_id in ref_id or comp.name in ref_id:
                 return comp.name
@@ -126,6 +274,23 @@ class DiagramGenerator:
                     return comp.name
         return None
 
+    def _index_routes_by_source(self, dft: DataFlowTask,
+                                index: ComponentIndex) -> Dict[str, List[Tuple[DataFlowPath, str]]]:
+        """Group paths with a resolvable destination by source component and output name."""
+        routes: Dict[str, List[Tuple[DataFlowPath, str]]] = {}
+        for path in dft.paths:
+            dest = self._extract_component_name(path.destination_ref_id, dft.components, index)
+            if not dest:
+                continue
+            # Format: Package\Task\Component.Outputs[Output Name]
+            tail = path.source_ref_id.rpartition('\\')[2]
+            keys = {tail.split('.', 1)[0]}
+            if tail.endswith(']') and '[' in tail:
+                keys.add(tail[tail.index('[') + 1:-1])
+            for key in keys:
+                routes.setdefault(key, []).append((path, dest))
+        return routes
+
     def _get_component_types(self, dft: DataFlowTask) -> Dict[str, str]:
         """Get component types for styling."""
         return {comp.name: comp.component_type for comp in dft.components}
@@ -134,118 +299,97 @@ class DiagramGenerator:
                                      paths: List[tuple], direction: str = "TB",
                                      component_types: Dict[str, str] = None) -> str:
         """Generate Mermaid.js flowchart syntax."""
-        lines = [f"---"]
-        lines.append(f"title: {title}")
-        lines.append("---")
-        lines.append(f"flowchart {direction}")
-
-        # Add subgraph for title
-        lines.append(f"    subgraph {self._sanitize_id(title)}[\"{title}\"]")
+        # Sanitize each node name once; nodes, edges and class assignments
+        # all reuse the same IDs
+        ids = {comp: self._sanitize_id(comp) for comp in components}
+        for source, dest, _ in paths:
+            for name in (source, dest):
+                if name not in ids:
+                    ids[name] = self._sanitize_id(name)
 
-        # Define node styles based on component type
         if component_types is None:
             component_types = {}
 
-        # Add nodes with appropriate shapes
-        for comp in components:
-            comp_id = self._sanitize_id(comp)
-            comp_type = component_types.get(comp, 'default')
-
-            if comp_type == 'Source':
-                lines.append(f"        {comp_id}[(\"{comp}\")]")  # Cylinder for source
-            elif comp_type == 'Destination':
-                lines.append(f"        {comp_id}[[\"{comp}\"]]")  # Subroutine shape for dest
-            elif 'Transform' in comp_type:
-                lines.append(f"        {comp_id}{{\"{comp}\"}}")  # Diamond for transform
-            else:
-                lines.append(f"        {comp_id}[\"{comp}\"]")  # Default rectangle
-
-        lines.append("    end")
-        lines.append("")
-
-        # Add paths/edges
-        for source, dest, label in paths:
-            source_id = self._sanitize_id(source)
-            dest_id = self._sanitize_id(dest)
-
-            if label:
-                lines.append(f"    {source_id} -->|{label}| {dest_id}")
-            else:
-                lines.append(f"    {source_id} --> {dest_id}")
-
-        # Add styling
-        lines.append("")
-        lines.append("    %% Styling")
-        lines.append("    classDef source fill:#e1f5fe,stroke:#01579b")
-        lines.append("    classDef destination fill:#e8f5e9,stroke:#1b5e20")
-        lines.append("    classDef transform fill:#fff3e0,stroke:#e65100")
-
-        # Apply styles
+        header = (
+            f"---\n"
+            f"title: {title}\n"
+            f"---\n"
+            f"flowchart {direction}\n"
+            f"    subgraph {self._sanitize_id(title)}[\"{title}\"]"
+        )
+
+        # Nodes with shapes and class assignments by component type
+        nodes = []
+        styles = []
         for comp in components:
-            comp_id = self._sanitize_id(comp)
-            comp_type = component_types.get(comp, 'default')
+            comp_id = ids[comp]
+            style = _node_style(component_types.get(comp, 'default'))
+            nodes.append(_NODE_TEMPLATES[style] % (comp_id, comp))
+            if style:
+                styles.append(f"    class {comp_id} {style}")
 
-            if comp_type == 'Source':
-                lines.append(f"    class {comp_id} source")
-            elif comp_type == 'Destination':
-                lines.append(f"    class {comp_id} destination")
-            elif 'Transform' in comp_type:
-                lines.append(f"    class {comp_id} transform")
+        edges = [
+            f"    {ids[source]} -->|{label}| {ids[dest]}" if label
+            else f"    {ids[source]} --> {ids[dest]}"
+            for source, dest, label in paths
+        ]
 
-        return '\n'.join(lines)
+        return '\n'.join([header, *nodes, "    end", "", *edges, _MERMAID_CLASS_DEFS, *styles])
 
     def _sanitize_id(self, name: str) -> str:
         """Sanitize a name for use as Mermaid node ID."""
-        # Replace special characters
-        result = name.replace(' ', '_').replace('-', '_').replace('.', '_')
-        result = ''.join(c for c in result if c.isalnum() or c == '_')
-        return result
+        result = name.translate(_SANITIZE_TABLE)
+        if result.isascii():
+            return result
+        # Non-ASCII names still need the per-character filter
+        return ''.join(c for c in result if c.isalnum() or c == '_')
 
     def _generate_ascii_control_flow(self) -> str:
         """Generate ASCII art for control flow."""
-        lines = []
-        lines.append("=" * 60)
-        lines.append(" CONTROL FLOW DIAGRAM")
-        lines.append("=" * 60)
-        lines.append("")
+        if self._ascii_control_flow is not None:
+            return self._ascii_control_flow
 
-        max_width = max(len(stage.name) for stage in self.package.control_flow_stages) if self.package.control_flow_stages else 20
+        lines = [_ASCII_CONTROL_FLOW_HEADER]
+
+        stages = self.package.control_flow_stages
+        max_width = max((len(stage.name) for stage in stages), default=20)
         box_width = max_width + 4
 
-        for i, stage in enumerate(self.package.control_flow_stages):
+        border = "    +" + "-" * box_width + "+"
+        for i, stage in enumerate(stages):
             # Draw stage box
-            lines.append("    " + "+" + "-" * box_width + "+")
-            lines.append("    " + "|" + stage.name.center(box_width) + "|")
-            lines.append("    " + "|" + f"({stage.stage_type})".center(box_width) + "|")
-            lines.append("    " + "+" + "-" * box_width + "+")
+            lines.append(
+                f"{border}\n"
+                f"    |{stage.name.center(box_width)}|\n"
+                f"    |{f'({stage.stage_type})'.center(box_width)}|\n"
+                f"{border}"
+            )
 
             # Draw arrow to next stage
-            if i < len(self.package.control_flow_stages) - 1:
+            if i < len(stages) - 1:
                 # Check for condition
-                next_stage = self.package.control_flow_stages[i + 1]
+                next_stage = stages[i + 1]
                 condition = next_stage.condition
 
                 lines.append("    " + " " * (box_width // 2 + 1) + "|")
                 if condition:
-                    cond_text = condition.replace('@[User::', '').replace(']', '').replace('==', '=')
+                    cond_text = _clean_condition(condition)
                     lines.append("    " + " " * 4 + f"[{cond_text}]")
                 lines.append("    " + " " * (box_width // 2 + 1) + "V")
                 lines.append("")
 
-        return '\n'.join(lines)
+        self._ascii_control_flow = '\n'.join(lines)
+        return self._ascii_control_flow
 
     def _generate_ascii_data_flow(self, dft: DataFlowTask) -> str:
         """Generate ASCII art for a data flow task."""
-        lines = []
-        lines.append("=" * 70)
-        lines.append(f" DATA FLOW: {dft.name}")
-        lines.append("=" * 70)
-        lines.append("")
+        lines = [_ASCII_DATA_FLOW_HEADER % dft.name]
 
         # Group components by type
-        sources = [c for c in dft.components if c.component_type == 'Source']
-        transforms = [c for c in dft.components if c.component_type == 'Transform']
-        destinations = [c for c in dft.components if c.component_type == 'Destination']
+        by_type = self.components_by_type(dft)
+        sources = by_type.get('Source', [])
+        transforms = by_type.get('Transform', [])
+        destinations = by_type.get('Destination', [])
 
         # Draw sources
         if sources:
@@ -254,10 +398,9 @@ class DiagramGenerator:
                 lines.append(f"    [({source.name})]")
                 if source.sql_command:
                     # Show abbreviated SQL
-                    sql_preview = source.sql_command.strip()[:50].replace('\n', ' ')
-                    lines.append(f"        SQL: {sql_preview}...")
-            lines.append("        |")
-            lines.append("        V")
+                    preview = sql_preview(source.sql_command, 50)
+                    lines.append(f"        SQL: {preview}...")
+            lines.append(_ASCII_DOWN_ARROW)
             lines.append("")
 
         # Draw transforms
@@ -265,26 +408,13 @@ class DiagramGenerator:
             lines.append("TRANSFORMATIONS:")
             for i, transform in enumerate(transforms):
                 # Determine symbol based on component class
-                if 'DerivedColumn' in transform.component_class:
-                    symbol = "{DER}"
-                elif 'ConditionalSplit' in transform.component_class:
-                    symbol = "{SPLIT}"
-                elif 'Lookup' in transform.component_class:
-                    symbol = "{LKP}"
-                elif 'Multicast' in transform.component_class:
-                    symbol = "{MCT}"
-                elif 'RowCount' in transform.component_class:
-                    symbol = "{RC}"
-                elif 'DataConvert' in transform.component_class:
-                    symbol = "{DCV}"
-                else:
-                    symbol = "{TRF}"
+                symbol = _transform_symbol(transform.component_class)
 
                 lines.append(f"    {symbol} {transform.name}")
 
                 # Show derived columns
                 if transform.output_columns:
-                    for col in transform.output_columns[:3]:
+                    for col in islice(transform.output_columns, 3):
                         if col.expression:
                             lines.append(f"          -> {col.name}: {col.expression[:40]}...")
 
@@ -297,11 +427,9 @@ class DiagramGenerator:
                             lines.append(f"          |-> [{cond.name}]: (Default)")
 
                 if i < len(transforms) - 1:
-                    lines.append("        |")
-                    lines.append("        V")
+                    lines.append(_ASCII_DOWN_ARROW)
 
-            lines.append("        |")
-            lines.append("        V")
+            lines.append(_ASCII_DOWN_ARROW)
             lines.append("")
 
         # Draw destinations
@@ -314,22 +442,18 @@ class DiagramGenerator:
             lines.append("")
 
         # Draw path summary
-        lines.append("-" * 70)
-        lines.append("DATA PATHS:")
+        lines.append(_ASCII_DATA_PATHS_HEADER)
+        index = self._build_component_index(dft.components)
         for path in dft.paths:
-            source = self._extract_component_name(path.source_ref_id, dft.components) or "?"
-            dest = self._extract_component_name(path.destination_ref_id, dft.components) or "?"
+            source = self._extract_component_name(path.source_ref_id, dft.components, index) or "?"
+            dest = self._extract_component_name(path.destination_ref_id, dft.components, index) or "?"
             lines.append(f"    {source} --> {dest}")
 
         return '\n'.join(lines)
 
     def generate_execution_order_diagram(self) -> str:
         """Generate a diagram showing execution order."""
-        lines = []
-        lines.append("=" * 60)
-        lines.append(" EXECUTION ORDER")
-        lines.append("=" * 60)
-        lines.append("")
+        lines = [_ASCII_EXECUTION_ORDER_HEADER]
 
         # Build execution order from precedence constraints
         execution_order = []
@@ -349,14 +473,14 @@ class DiagramGenerator:
             if stage.description:
                 lines.append(f"         Description: {stage.description}")
             if stage.condition:
-                cond = stage.condition.replace('@[User::', '').replace(']', '')
+                cond = _clean_condition(stage.condition, collapse_equals=False)
                 lines.append(f"         Condition: {cond}")
 
             # List tasks within the stage
             if stage.tasks:
                 lines.append("         Tasks:")
                 for task in stage.tasks:
-                    lines.append(f"           - {task.get('name', 'Unknown')}")
+                    lines.append(f"           - {task.name}")
 
             lines.append("")
             current_order += 1
@@ -365,22 +489,18 @@ class DiagramGenerator:
 
     def generate_routing_logic_diagram(self) -> str:
         """Generate a diagram showing data routing logic."""
-        lines = []
-        lines.append("=" * 70)
-        lines.append(" DATA ROUTING LOGIC")
-        lines.append("=" * 70)
-        lines.append("")
+        lines = [_ASCII_ROUTING_LOGIC_HEADER]
 
         for dft in self.package.data_flow_tasks:
-            lines.append(f"Data Flow: {dft.name}")
-            lines.append("-" * 50)
-            lines.append("")
+            lines.append(_ASCII_DATA_FLOW_TITLE % dft.name)
+            index = self._build_component_index(dft.components)
+            routes = self._index_routes_by_source(dft, index)
 
             # Find conditional splits and their routing
             for comp in dft.components:
                 if comp.conditional_outputs:
                     lines.append(f"  Routing Component: {comp.name}")
-                    lines.append(f"  Type: {comp.component_class.split('.')[-1]}")
+                    lines.append(f"  Type: {comp.short_class}")
                     lines.append("")
 
                     for i, cond in enumerate(comp.conditional_outputs, 1):
@@ -395,33 +515,21 @@ class DiagramGenerator:
                                 lines.append(f"      Condition: {cond.expression}")
 
                         # Find where this route goes
-                        for path in dft.paths:
-                            if cond.name in path.source_ref_id:
-                                dest = self._extract_component_name(
-                                    path.destination_ref_id, dft.components
-                                )
-                                if dest:
-                                    lines.append(f"      Destination: {dest}")
+                        for path, dest in routes.get(cond.name, ()):
+                            lines.append(f"      Destination: {dest}")
 
                         lines.append("")
 
                 # Show lookup no-match routing
                 if 'Lookup' in comp.component_class:
-                    lines.append(f"  Lookup: {comp.name}")
-                    lines.append(f"    Match Output: Rows with matching reference data")
-                    lines.append(f"    No Match Output: Rows without matching reference data")
+                    lines.append(_ASCII_LOOKUP_ROUTING % comp.name)
 
                     # Find destinations
-                    for path in dft.paths:
-                        if comp.name in path.source_ref_id:
-                            dest = self._extract_component_name(
-                                path.destination_ref_id, dft.components
-                            )
-                            if dest:
-                                if 'Match' in path.name:
-                                    lines.append(f"      -> Match goes to: {dest}")
-                                elif 'NoMatch' in path.name or 'No Match' in path.name:
-                                    lines.append(f"      -> No Match goes to: {dest}")
+                    for path, dest in routes.get(comp.name, ()):
+                        if 'Match' in path.name:
+                            lines.append(f"      -> Match goes to: {dest}")
+                        elif 'NoMatch' in path.name or 'No Match' in path.name:
+                            lines.append(f"      -> No Match goes to: {dest}")
 
                     lines.append("")
 
@@ -430,13 +538,8 @@ class DiagramGenerator:
                     lines.append(f"  Multicast: {comp.name}")
                     lines.append(f"    Sends all rows to multiple destinations:")
 
-                    for path in dft.paths:
-                        if comp.name in path.source_ref_id:
-                            dest = self._extract_component_name(
-                                path.destination_ref_id, dft.components
-                            )
-                            if dest:
-                                lines.append(f"      -> {dest}")
+                    for path, dest in routes.get(comp.name, ()):
+                        lines.append(f"      -> {dest}")
 
                     lines.append("")
 
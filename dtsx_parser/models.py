@@ -3,12 +3,45 @@ Data models for DTSX package components.
 These dataclasses represent all the extracted information from SSIS packages.
 """
 
+import re
+import sys
 from dataclasses import dataclass, field
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Callable, NamedTuple
 from enum import Enum
+from functools import lru_cache
 from datetime import datetime
 
 
+def _intern(value: Any) -> Any:
+    """Intern categorical strings so repeated values share one object."""
+    return sys.intern(value) if type(value) is str else value
+
+
+@lru_cache(maxsize=None)
+def _short_class_name(component_class: str) -> str:
+    """Last dotted segment of a component class name."""
+    return component_class.rpartition('.')[2]
+
+
+# Leading whitespace run, and the first non-whitespace character
+_LEADING_SPACE_RE = re.compile(r'\s*')
+_NON_SPACE_RE = re.compile(r'\S')
+
+
+def sql_preview(sql: str, limit: int, one_line: bool = True) -> str:
+    """Return the stripped first ``limit`` characters of SQL, on one line by default.
+
+    Equivalent to ``sql.strip()[:limit]`` (then ``.replace('\\n', ' ')``) but
+    only the head of the statement is copied or scanned.
+    """
+    start = _LEADING_SPACE_RE.match(sql).end()
+    end = start + limit
+    head = sql[start:end]
+    if not _NON_SPACE_RE.search(sql, end):
+        head = head.rstrip()
+    return head.replace('\n', ' ') if one_line else head
+
+
 class DataType(Enum):
     """SSIS data types mapped from DTS:DataType values."""
     INT16 = 2
@@ -34,7 +67,7 @@ class DataType(Enum):
     DBTIMESTAMP = 135
 
 
-@dataclass
+@dataclass(slots=True)
 class PackageMetadata:
     """Package-level metadata and configuration."""
     name: str
@@ -50,7 +83,7 @@ class PackageMetadata:
     locale_id: Optional[str] = None
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Annotation:
     """Package annotation/documentation."""
     ref_id: str
@@ -60,7 +93,7 @@ class Annotation:
     creation_date: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class ConnectionManager:
     """Database/file connection configuration."""
     name: str
@@ -74,8 +107,11 @@ class ConnectionManager:
     description: Optional[str] = None
     properties: Dict[str, Any] = field(default_factory=dict)
 
+    def __post_init__(self):
+        self.connection_type = _intern(self.connection_type)
+
 
-@dataclass
+@dataclass(slots=True)
 class Variable:
     """Package or container variable."""
     name: str
@@ -88,8 +124,11 @@ class Variable:
     read_only: bool = False
     raise_event_on_change: bool = False
 
+    def __post_init__(self):
+        self.namespace = _intern(self.namespace)
 
-@dataclass
+
+@dataclass(slots=True)
 class Parameter:
     """Package parameter (configurable at runtime)."""
     name: str
@@ -101,7 +140,7 @@ class Parameter:
     required: bool = False
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Column:
     """Data column definition."""
     name: str
@@ -113,7 +152,7 @@ class Column:
     is_nullable: bool = True
 
 
-@dataclass
+@dataclass(slots=True)
 class OutputColumn:
     """Data flow output column with expression."""
     name: str
@@ -124,7 +163,7 @@ class OutputColumn:
     description: Optional[str] = None
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ConditionalOutput:
     """Conditional split output definition."""
     name: str
@@ -134,7 +173,7 @@ class ConditionalOutput:
     is_default: bool = False
 
 
-@dataclass
+@dataclass(slots=True)
 class DataFlowComponent:
     """Component within a data flow task."""
     name: str
@@ -151,9 +190,18 @@ class DataFlowComponent:
     properties: Dict[str, Any] = field(default_factory=dict)
     has_error_output: bool = False
 
+    def __post_init__(self):
+        self.component_type = _intern(self.component_type)
+        self.component_class = _intern(self.component_class)
+
+    @property
+    def short_class(self) -> str:
+        """Component class without its namespace, e.g. 'OLEDBSource'."""
+        # Class names are interned and repeat across components; cache per name
+        return _short_class_name(self.component_class)
+
 
-@dataclass
-class DataFlowPath:
+class DataFlowPath(NamedTuple):
     """Connection between data flow components."""
     name: str
     ref_id: str
@@ -163,7 +211,7 @@ class DataFlowPath:
     destination_component: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class DataFlowTask:
     """Data flow task containing transformation pipeline."""
     name: str
@@ -173,9 +221,15 @@ class DataFlowTask:
     components: List[DataFlowComponent] = field(default_factory=list)
     paths: List[DataFlowPath] = field(default_factory=list)
 
+    def components_by_type(self) -> Dict[str, List[DataFlowComponent]]:
+        """Group components by component_type in a single pass."""
+        buckets: Dict[str, List[DataFlowComponent]] = {}
+        for comp in self.components:
+            buckets.setdefault(comp.component_type, []).append(comp)
+        return buckets
 
-@dataclass
-class ParameterBinding:
+
+class ParameterBinding(NamedTuple):
     """SQL task parameter binding."""
     parameter_name: str
     variable_name: str
@@ -183,14 +237,13 @@ class ParameterBinding:
     data_type: Optional[int] = None
 
 
-@dataclass
-class ResultBinding:
+class ResultBinding(NamedTuple):
     """SQL task result binding."""
     result_name: str
     variable_name: str
 
 
-@dataclass
+@dataclass(slots=True)
 class SqlTask:
     """Execute SQL task configuration."""
     name: str
@@ -204,7 +257,7 @@ class SqlTask:
     result_bindings: List[ResultBinding] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class SendMailTask:
     """Send mail task configuration."""
     name: str
@@ -219,8 +272,7 @@ class SendMailTask:
     priority: str = "Normal"
 
 
-@dataclass
-class PrecedenceConstraint:
+class PrecedenceConstraint(NamedTuple):
     """Execution order constraint between tasks."""
     name: str
     ref_id: str
@@ -233,7 +285,7 @@ class PrecedenceConstraint:
     eval_op: Optional[int] = None  # 1=Expression, 2=Constraint, 3=Both
 
 
-@dataclass
+@dataclass(slots=True)
 class Executable:
     """Base executable (task or container)."""
     name: str
@@ -244,39 +296,115 @@ class Executable:
     disabled: bool = False
     delay_validation: bool = False
 
+    def __post_init__(self):
+        self.executable_type = _intern(self.executable_type)
+
 
-@dataclass
+@dataclass(slots=True)
 class SequenceContainer(Executable):
     """Sequence container grouping tasks."""
     executables: List['Executable'] = field(default_factory=list)
     precedence_constraints: List[PrecedenceConstraint] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
+class TaskInfo:
+    """Task inside a control flow stage or event handler."""
+    name: str
+    ref_id: str
+    dtsid: str
+    task_type: str
+    description: Optional[str] = None
+    sql: Optional[SqlTask] = None
+    mail: Optional[SendMailTask] = None
+
+    def __post_init__(self):
+        self.task_type = _intern(self.task_type)
+
+    @property
+    def is_send_mail(self) -> bool:
+        """True for Send Mail tasks."""
+        return self.mail is not None
+
+    @property
+    def sql_statement(self) -> Optional[str]:
+        """SQL text of an Execute SQL task."""
+        return self.sql.sql_statement if self.sql is not None else None
+
+    @property
+    def to_address(self) -> Optional[str]:
+        """Recipients of a Send Mail task."""
+        return self.mail.to_address if self.mail is not None else None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Flatten into a plain dict for JSON output."""
+        data = {
+            'name': self.name,
+            'ref_id': self.ref_id,
+            'dtsid': self.dtsid,
+            'type': self.task_type,
+            'description': self.description,
+        }
+        sql = self.sql
+        if sql is not None:
+            data['sql_statement'] = sql.sql_statement
+            data['connection'] = sql.connection_ref
+            data['result_set_type'] = sql.result_set_type
+            data['parameter_bindings'] = [
+                {'parameter_name': b.parameter_name, 'variable_name': b.variable_name}
+                for b in sql.parameter_bindings
+            ]
+            data['result_bindings'] = [
+                {'result_name': b.result_name, 'variable_name': b.variable_name}
+                for b in sql.result_bindings
+            ]
+        mail = self.mail
+        if mail is not None:
+            data['from_address'] = mail.from_address
+            data['to_address'] = mail.to_address
+            data['subject'] = mail.subject
+            data['message_source'] = mail.message_source
+            data['smtp_connection'] = mail.smtp_connection
+        return data
+
+
+@dataclass(slots=True)
 class ControlFlowStage:
     """A stage in the control flow with execution order."""
     order: int
     name: str
     stage_type: str  # Sequence, DataFlow, SqlTask, etc.
     description: Optional[str] = None
-    tasks: List[Dict[str, Any]] = field(default_factory=list)
+    tasks: List[TaskInfo] = field(default_factory=list)
     precedence_from: List[str] = field(default_factory=list)
     precedence_to: List[str] = field(default_factory=list)
     condition: Optional[str] = None
+    ref_id: str = ''
+
+    def __post_init__(self):
+        self.stage_type = _intern(self.stage_type)
 
 
-@dataclass
+@dataclass(slots=True)
 class EventHandler:
     """Package event handler."""
     name: str
     ref_id: str
     dtsid: str
     event_name: str  # OnError, OnWarning, etc.
-    executables: List[Dict[str, Any]] = field(default_factory=list)
+    executables: List[TaskInfo] = field(default_factory=list)
     precedence_constraints: List[PrecedenceConstraint] = field(default_factory=list)
 
+    def __post_init__(self):
+        self.event_name = _intern(self.event_name)
 
-@dataclass
+    @property
+    def is_error(self) -> bool:
+        """True for error event handlers such as OnError."""
+        return 'Error' in self.event_name
+
+
+@dataclass(slots=True)
 class ErrorHandlingStrategy:
     """Error handling configuration for the package."""
     event_handlers: List[EventHandler] = field(default_factory=list)
@@ -287,7 +415,7 @@ class ErrorHandlingStrategy:
     logged_events: List[str] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class DatabaseObject:
     """Referenced database object."""
     name: str
@@ -297,8 +425,13 @@ class DatabaseObject:
     connection: Optional[str] = None
     usage: str = "Unknown"  # Source, Destination, Lookup, Reference
 
+    def __post_init__(self):
+        self.object_type = _intern(self.object_type)
+        self.schema = _intern(self.schema)
+        self.usage = _intern(self.usage)
+
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Threshold:
     """Critical threshold or alert configuration."""
     name: str
@@ -309,7 +442,7 @@ class Threshold:
     action: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Alert:
     """Alert configuration from the package."""
     name: str
@@ -320,17 +453,60 @@ class Alert:
     category: str = "General"
 
 
-@dataclass
+@dataclass(slots=True, init=False)
 class DataFlowDiagram:
     """Visual representation of a data flow."""
     name: str
-    components: List[str] = field(default_factory=list)
-    paths: List[tuple] = field(default_factory=list)
-    mermaid_code: Optional[str] = None
-    ascii_diagram: Optional[str] = None
-
-
-@dataclass
+    components: List[str]
+    paths: List[tuple]
+    # Renderers are called on first access; the rendered text is cached.
+    mermaid_renderer: Optional[Callable[[], str]] = field(repr=False, compare=False)
+    ascii_renderer: Optional[Callable[[], str]] = field(repr=False, compare=False)
+    _mermaid_code: Optional[str] = field(repr=False, compare=False)
+    _ascii_diagram: Optional[str] = field(repr=False, compare=False)
+
+    def __init__(self, name: str, components: Optional[List[str]] = None,
+                 paths: Optional[List[tuple]] = None,
+                 mermaid_code: Optional[str] = None, ascii_diagram: Optional[str] = None,
+                 mermaid_renderer: Optional[Callable[[], str]] = None,
+                 ascii_renderer: Optional[Callable[[], str]] = None):
+        """Text passed as mermaid_code/ascii_diagram seeds the lazy cache."""
+        self.name = name
+        self.components = components if components is not None else []
+        self.paths = paths if paths is not None else []
+        self._mermaid_code = mermaid_code
+        self._ascii_diagram = ascii_diagram
+        self.mermaid_renderer = mermaid_renderer
+        self.ascii_renderer = ascii_renderer
+
+    @property
+    def mermaid_code(self) -> Optional[str]:
+        """Mermaid source, rendered lazily on first access."""
+        if self._mermaid_code is None and self.mermaid_renderer is not None:
+            self._mermaid_code = self.mermaid_renderer()
+            self.mermaid_renderer = None
+        return self._mermaid_code
+
+    @mermaid_code.setter
+    def mermaid_code(self, value: Optional[str]) -> None:
+        self._mermaid_code = value
+        self.mermaid_renderer = None
+
+    @property
+    def ascii_diagram(self) -> Optional[str]:
+        """ASCII art rendering, produced lazily on first access."""
+        if self._ascii_diagram is None and self.ascii_renderer is not None:
+            self._ascii_diagram = self.ascii_renderer()
+            self.ascii_renderer = None
+        return self._ascii_diagram
+
+    @ascii_diagram.setter
+    def ascii_diagram(self, value: Optional[str]) -> None:
+        self._ascii_diagram = value
+        self.ascii_renderer = None
+
+
+@dataclass(slots=True)
 class DtsxPackage:
     """Complete parsed DTSX package."""
     metadata: PackageMetadata
@@ -346,3 +522,10 @@ class DtsxPackage:
     alerts: List[Alert] = field(default_factory=list)
     data_flow_diagrams: List[DataFlowDiagram] = field(default_factory=list)
     raw_precedence_constraints: List[PrecedenceConstraint] = field(default_factory=list)
+
+    def database_objects_by_type(self) -> Dict[str, List[DatabaseObject]]:
+        """Group database objects by object_type in a single pass."""
+        buckets: Dict[str, List[DatabaseObject]] = {}
+        for obj in self.database_objects:
+            buckets.setdefault(obj.object_type, []).append(obj)
+        return buckets
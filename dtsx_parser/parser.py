@@ -8,6 +8,11 @@ variables, parameters, and error handling configuration.
 
 import xml.etree.ElementTree as ET
 import re
+import sys
+from bisect import bisect_right
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from typing import List, Dict, Any, Optional, Tuple
 from pathlib import Path
 
@@ -16,9 +21,142 @@ from .models import (
     Variable, Parameter, ControlFlowStage, DataFlowTask, DataFlowComponent,
     DataFlowPath, Column, OutputColumn, ConditionalOutput, SqlTask,
     SendMailTask, PrecedenceConstraint, EventHandler, ErrorHandlingStrategy,
-    DatabaseObject, Threshold, Alert, ParameterBinding, ResultBinding
+    DatabaseObject, Threshold, Alert, ParameterBinding, ResultBinding, TaskInfo
 )
 
+# Connection string keys (lower-cased) mapped to the field they populate
+_CONNECTION_STRING_KEYS = {
+    'data source': 'server',
+    'server': 'server',
+    'smtpserver': 'server',
+    'initial catalog': 'database',
+    'database': 'database',
+    'provider': 'provider',
+}
+
+# Database object references in SQL text, matched in a single scan. A bare
+# function name only starts at an identifier boundary, so long dotted runs
+# are not rescanned from every position.
+_FUNCTION_CALL = r'''(?P<function>(?:\[|(?<![\w.]))[\w.]+\]?\.\[?fn_\w+\]?)\s*\('''
+_SQL_OBJECT_RE = re.compile(r'''
+      (?:FROM|INTO|UPDATE|JOIN)\s+(?P<table>\[?[\w.]+\]?\.\[?\w+\]?)
+    | EXEC(?:UTE)?\s+(?P<procedure>\[?[\w.]+\]?\.\[?\w+\]?)
+    | ''' + _FUNCTION_CALL, re.IGNORECASE | re.VERBOSE)
+# A function call starting inside a table or procedure name, as in
+# "FROM [db].[dbo].[fn_x](", which the single scan steps over
+_FUNCTION_CALL_RE = re.compile(_FUNCTION_CALL, re.IGNORECASE)
+# Joins SQL texts for a single scan; matches neither whitespace nor name characters
+_SQL_SEPARATOR = '\x00'
+
+# Known threshold variable name fragments (lower-cased) and their category,
+# in priority order
+_THRESHOLD_PATTERNS = (
+    ('threshold', 'General'),
+    ('limit', 'General'),
+    ('max', 'Performance'),
+    ('min', 'Performance'),
+    ('score', 'Fraud'),
+    ('window', 'Time'),
+    ('batch', 'Performance'),
+    ('fraud', 'Fraud'),
+    ('compliance', 'Compliance'),
+)
+# Zero-width lookahead so overlapping fragments (e.g. 'limithreshold') are all found
+_THRESHOLD_RE = re.compile('(?=(%s))' % '|'.join(p for p, _ in _THRESHOLD_PATTERNS))
+_THRESHOLD_RANKS = {p: (rank, category) for rank, (p, category) in enumerate(_THRESHOLD_PATTERNS)}
+
+# Qualified DTS container tags and attribute keys
+_DTS_NS = '{www.microsoft.com/SqlServer/Dts}'
+_DTS_EXECUTABLES = _DTS_NS + 'Executables'
+_DTS_EXECUTABLE = _DTS_NS + 'Executable'
+_DTS_PRECEDENCE_CONSTRAINTS = _DTS_NS + 'PrecedenceConstraints'
+_DTS_PRECEDENCE_CONSTRAINT = _DTS_NS + 'PrecedenceConstraint'
+_DTS_OBJECT_NAME = _DTS_NS + 'ObjectName'
+_DTS_REF_ID = _DTS_NS + 'refId'
+_DTS_DTSID = _DTS_NS + 'DTSID'
+_DTS_EVENT_NAME = _DTS_NS + 'EventName'
+# Child paths; ElementPath compiles and caches each one on first use
+_DTS_EXECUTABLES_PATH = _DTS_EXECUTABLES + '/' + _DTS_EXECUTABLE
+_DTS_PRECEDENCE_CONSTRAINTS_PATH = _DTS_PRECEDENCE_CONSTRAINTS + '/' + _DTS_PRECEDENCE_CONSTRAINT
+
+# Qualified task attribute keys. ElementTree expands namespace prefixes, so
+# literal 'SQLTask:' / 'SendMailTask:' keys never occur.
+_SQL_NS = '{www.microsoft.com/sqlserver/dts/tasks/sqltask}'
+_SQL_STATEMENT_SOURCE = _SQL_NS + 'SqlStatementSource'
+_SQL_CONNECTION = _SQL_NS + 'Connection'
+_SQL_RESULT_SET_TYPE = _SQL_NS + 'ResultSetType'
+_SQL_PARAMETER_NAME = _SQL_NS + 'ParameterName'
+_SQL_RESULT_NAME = _SQL_NS + 'ResultName'
+_SQL_VARIABLE_NAME = _SQL_NS + 'DtsVariableName'
+_MAIL_NS = '{www.microsoft.com/sqlserver/dts/tasks/sendmailtask}'
+_MAIL_FROM = _MAIL_NS + 'From'
+_MAIL_TO = _MAIL_NS + 'To'
+_MAIL_SUBJECT = _MAIL_NS + 'Subject'
+_MAIL_SMTP_SERVER = _MAIL_NS + 'SMTPServer'
+
+# ObjectData children that carry a connection string
+_CONNECTION_DATA_TAGS = frozenset(('ConnectionManager', 'SmtpConnectionManager'))
+
+# Stage types keyed by the exact CreationName / ExecutableType values SSIS writes
+_EXECUTABLE_KINDS = {
+    'STOCK:SEQUENCE': 'Sequence',
+    'Microsoft.Pipeline': 'DataFlow',
+    'Microsoft.ExecuteSQLTask': 'SqlTask',
+    'Microsoft.SendMailTask': 'SendMailTask',
+}
+# Substring fallback for versioned or assembly-qualified names, in priority order
+_EXECUTABLE_KIND_MARKERS = (
+    ('SEQUENCE', 'Sequence'),
+    ('Pipeline', 'DataFlow'),
+    ('ExecuteSQLTask', 'SqlTask'),
+    ('SendMailTask', 'SendMailTask'),
+)
+
+
+def _executable_kind(exec_type: str, creation_name: str) -> Optional[str]:
+    """Classify an executable as Sequence, DataFlow, SqlTask or SendMailTask."""
+    kind = _EXECUTABLE_KINDS.get(creation_name) or _EXECUTABLE_KINDS.get(exec_type)
+    if kind is None:
+        for marker, marker_kind in _EXECUTABLE_KIND_MARKERS:
+            if marker in exec_type or marker in creation_name:
+                return marker_kind
+    return kind
+
+
+_BRACKETS = str.maketrans('', '', '[]')
+
+
+def _split_qualified(raw: str) -> Tuple[str, str]:
+    """Split a possibly bracketed [db.]schema.object name into (schema, object)."""
+    name = raw.translate(_BRACKETS)
+    head, sep, obj_name = name.rpartition('.')
+    if not sep:
+        return 'dbo', name
+    return head.rpartition('.')[2] or 'dbo', obj_name
+
+
+@lru_cache(maxsize=None)
+def _local_name(tag: str) -> str:
+    """Strip the '{namespace}' prefix from an element tag."""
+    return tag.rpartition('}')[2]
+
+
+def _share(strings: Dict[str, str], value: Optional[str]) -> Optional[str]:
+    """Share one string object per distinct repeated value in ``strings``."""
+    if value is None:
+        return None
+    return strings.setdefault(value, value)
+
+
+def _get_dts_attr(elem: ET.Element, attr: str, default: Any = None) -> Any:
+    """Get an attribute with or without the DTS namespace."""
+    # A literal 'DTS:' key cannot occur: ElementTree resolves prefixes and
+    # rejects undeclared ones.
+    value = elem.get(_DTS_NS + attr)
+    if value is not None:
+        return value
+    return elem.get(attr, default)
+
 
 class DtsxParser:
     """Parser for DTSX (SSIS) package files."""
@@ -29,18 +167,31 @@ class DtsxParser:
         'SQLTask': 'www.microsoft.com/sqlserver/dts/tasks/sqltask',
         'SendMailTask': 'www.microsoft.com/sqlserver/dts/tasks/sendmailtask'
     }
+    _DTS_PREFIX = _DTS_NS
 
-    def __init__(self, file_path: str):
-        """Initialize parser with DTSX file path."""
+    # Below this many pipeline components, forking workers costs more than it saves
+    PARALLEL_MIN_COMPONENTS = 500
+    PARALLEL_MIN_STATEMENTS = 2000
+    SQL_BATCH_SIZE = 256
+
+    def __init__(self, file_path: str, max_workers: Optional[int] = None):
+        """Initialize parser with DTSX file path.
+
+        Pass max_workers > 1 to parse large data flow tasks and scan large
+        volumes of SQL in a process pool.
+        """
         self.file_path = Path(file_path)
+        self.max_workers = max_workers
         self.tree = None
         self.root = None
         self.package = None
+        self._by_tag: Dict[str, List[ET.Element]] = {}
+        self._strings: Dict[str, str] = {}
 
     def parse(self) -> DtsxPackage:
         """Parse the DTSX file and return a DtsxPackage object."""
-        self.tree = ET.parse(self.file_path)
-        self.root = self.tree.getroot()
+        self.root, self._by_tag = self._load_indexed(self.file_path)
+        self.tree = ET.ElementTree(self.root)
 
         # Register namespaces for proper parsing
         for prefix, uri in self.NAMESPACES.items():
@@ -61,11 +212,11 @@ class DtsxParser:
         error_handling = self._parse_error_handling()
 
         # Extract database objects from SQL statements
-        database_objects = self._extract_database_objects()
+        database_objects = self._extract_database_objects(control_flow_stages, data_flow_tasks)
 
         # Extract thresholds and alerts
         thresholds = self._extract_thresholds(variables)
-        alerts = self._extract_alerts()
+        alerts = self._extract_alerts(control_flow_stages, error_handling)
 
         self.package = DtsxPackage(
             metadata=metadata,
@@ -81,22 +232,33 @@ class DtsxParser:
             alerts=alerts,
             raw_precedence_constraints=precedence_constraints
         )
+        # The index is only needed while extracting; drop the extra references.
+        self._by_tag = {}
+        self._strings = {}
 
         return self.package
 
+    @staticmethod
+    def _load_indexed(source: Path) -> Tuple[ET.Element, Dict[str, List[ET.Element]]]:
+        """Stream the document into a tree, indexing elements by local tag name.
+
+        Elements are indexed on their start event, so each bucket is in
+        document order. Nothing is cleared while streaming: the whole tree
+        stays in memory, so peak memory is the same as with ET.parse.
+        """
+        by_tag = defaultdict(list)
+        events = ET.iterparse(source, events=('start',))
+        for _, elem in events:
+            by_tag[_local_name(elem.tag)].append(elem)
+        return events.root, dict(by_tag)
+
+    def _s(self, value: Optional[str]) -> Optional[str]:
+        """Share one string object per distinct repeated value within a parse."""
+        return _share(self._strings, value)
+
     def _get_attr(self, elem: ET.Element, attr: str, default: Any = None) -> Any:
         """Get attribute value with namespace prefix handling."""
-        # Try with DTS namespace
-        value = elem.get(f'{{{self.NAMESPACES["DTS"]}}}{attr}')
-        if value is not None:
-            return value
-        # Try without namespace
-        value = elem.get(attr)
-        if value is not None:
-            return value
-        # Try with DTS: prefix
-        value = elem.get(f'DTS:{attr}')
-        return value if value is not None else default
+        return _get_dts_attr(elem, attr, default)
 
     def _parse_metadata(self) -> PackageMetadata:
         """Parse package metadata from root element."""
@@ -115,8 +277,8 @@ class DtsxParser:
 
     def _find_property_value(self, prop_name: str) -> Optional[str]:
         """Find a property value in the package."""
-        for prop in self.root.iter():
-            if 'Property' in prop.tag and self._get_attr(prop, 'Name') == prop_name:
+        for prop in self._by_tag.get('Property', ()):
+            if self._get_attr(prop, 'Name') == prop_name:
                 return prop.text
         return None
 
@@ -124,23 +286,22 @@ class DtsxParser:
         """Parse package annotations/documentation."""
         annotations = []
 
-        for elem in self.root.iter():
-            if 'Annotations' in elem.tag:
-                for ann in elem:
-                    if 'Annotation' in ann.tag:
-                        text_elem = None
-                        for child in ann:
-                            if 'AnnotationText' in child.tag:
-                                text_elem = child.text
-                                break
-
-                        annotations.append(Annotation(
-                            ref_id=self._get_attr(ann, 'refId', ''),
-                            description=self._get_attr(ann, 'Description'),
-                            tag=self._get_attr(ann, 'Tag'),
-                            text=text_elem,
-                            creation_date=self._get_attr(ann, 'CreationDate')
-                        ))
+        for elem in self._by_tag.get('Annotations', ()):
+            for ann in elem:
+                if _local_name(ann.tag) == 'Annotation':
+                    text_elem = None
+                    for child in ann:
+                        if _local_name(child.tag) == 'AnnotationText':
+                            text_elem = child.text
+                            break
+
+                    annotations.append(Annotation(
+                        ref_id=self._get_attr(ann, 'refId', ''),
+                        description=self._get_attr(ann, 'Description'),
+                        tag=self._get_attr(ann, 'Tag'),
+                        text=text_elem,
+                        creation_date=self._get_attr(ann, 'CreationDate')
+                    ))
 
         return annotations
 
@@ -148,42 +309,38 @@ class DtsxParser:
         """Parse connection manager definitions."""
         connections = []
 
-        for elem in self.root.iter():
-            if elem.tag.endswith('ConnectionManagers'):
-                for conn in elem:
-                    if 'ConnectionManager' in conn.tag:
-                        conn_type = self._get_attr(conn, 'CreationName', 'Unknown')
-                        conn_string = None
-                        props = {}
-
-                        # Parse ObjectData for connection string
-                        for obj_data in conn.iter():
-                            if 'ObjectData' in obj_data.tag:
-                                for child in obj_data:
-                                    if 'ConnectionManager' in child.tag:
-                                        conn_string = self._get_attr(child, 'ConnectionString')
-                                        # Get additional properties
-                                        for attr in child.attrib:
-                                            clean_attr = attr.split('}')[-1] if '}' in attr else attr
-                                            if clean_attr not in ['ConnectionString']:
-                                                props[clean_attr] = child.attrib[attr]
-                                    elif 'SmtpConnectionManager' in child.tag:
-                                        conn_string = self._get_attr(child, 'ConnectionString')
-
-                        # Parse server and database from connection string
-                        server, database, provider = self._parse_connection_string(conn_string)
-
-                        connections.append(ConnectionManager(
-                            name=self._get_attr(conn, 'ObjectName', 'Unknown'),
-                            ref_id=self._get_attr(conn, 'refId', ''),
-                            dtsid=self._get_attr(conn, 'DTSID', ''),
-                            connection_type=conn_type,
-                            connection_string=conn_string,
-                            server=server,
-                            database=database,
-                            provider=provider,
-                            properties=props
-                        ))
+        for elem in self._by_tag.get('ConnectionManagers', ()):
+            for conn in elem:
+                if _local_name(conn.tag) == 'ConnectionManager':
+                    conn_type = self._get_attr(conn, 'CreationName', 'Unknown')
+                    conn_string = None
+                    props = {}
+
+                    # Parse ObjectData for connection string
+                    for obj_data in conn.iter(self._DTS_PREFIX + 'ObjectData'):
+                        for child in obj_data:
+                            if _local_name(child.tag) in _CONNECTION_DATA_TAGS:
+                                conn_string = self._get_attr(child, 'ConnectionString')
+                                # Get additional properties
+                                for attr in child.attrib:
+                                    clean_attr = attr.split('}')[-1] if '}' in attr else attr
+                                    if clean_attr not in ['ConnectionString']:
+                                        props[clean_attr] = child.attrib[attr]
+
+                    # Parse server and database from connection string
+                    server, database, provider = self._parse_connection_string(conn_string)
+
+                    connections.append(ConnectionManager(
+                        name=self._get_attr(conn, 'ObjectName', 'Unknown'),
+                        ref_id=self._get_attr(conn, 'refId', ''),
+                        dtsid=self._get_attr(conn, 'DTSID', ''),
+                        connection_type=conn_type,
+                        connection_string=conn_string,
+                        server=server,
+                        database=database,
+                        provider=provider,
+                        properties=props
+                    ))
 
         return connections
 
@@ -192,55 +349,42 @@ class DtsxParser:
         if not conn_string:
             return None, None, None
 
-        server = None
-        database = None
-        provider = None
-
-        # Parse common connection string formats
-        patterns = {
-            'server': r'(?:Data Source|Server)=([^;]+)',
-            'database': r'(?:Initial Catalog|Database)=([^;]+)',
-            'provider': r'Provider=([^;]+)'
-        }
-
-        for key, pattern in patterns.items():
-            match = re.search(pattern, conn_string, re.IGNORECASE)
-            if match:
-                if key == 'server':
-                    server = match.group(1)
-                elif key == 'database':
-                    database = match.group(1)
-                elif key == 'provider':
-                    provider = match.group(1)
-
-        return server, database, provider
+        # Key=Value;Key=Value;... - the first non-empty value for each field wins
+        fields = {}
+        for pair in conn_string.split(';'):
+            key, _, value = pair.partition('=')
+            field_name = _CONNECTION_STRING_KEYS.get(key.strip().lower())
+            value = value.strip()
+            if field_name and value and field_name not in fields:
+                fields[field_name] = value
+
+        return fields.get('server'), fields.get('database'), fields.get('provider')
 
     def _parse_variables(self) -> List[Variable]:
         """Parse package variables."""
         variables = []
 
-        for elem in self.root.iter():
-            if elem.tag.endswith('Variables') and not elem.tag.endswith('PackageVariables'):
-                for var in elem:
-                    if 'Variable' in var.tag:
-                        value = None
-                        data_type = 8  # Default to string
-
-                        for child in var:
-                            if 'VariableValue' in child.tag:
-                                data_type = int(self._get_attr(child, 'DataType', 8))
-                                value = child.text
-                                break
-
-                        variables.append(Variable(
-                            name=self._get_attr(var, 'ObjectName', 'Unknown'),
-                            namespace=self._get_attr(var, 'Namespace', 'User'),
-                            dtsid=self._get_attr(var, 'DTSID', ''),
-                            data_type=data_type,
-                            value=value,
-                            expression=self._get_attr(var, 'Expression'),
-                            read_only=self._get_attr(var, 'ReadOnly', 'False') == 'True'
-                        ))
+        for elem in self._by_tag.get('Variables', ()):
+            for var in elem:
+                if _local_name(var.tag) == 'Variable':
+                    value = None
+                    data_type = 8  # Default to string
+
+                    for child in var:
+                        if _local_name(child.tag) == 'VariableValue':
+                            data_type = int(self._get_attr(child, 'DataType', 8))
+                            value = child.text
+                            break
+
+                    variables.append(Variable(
+                        name=self._get_attr(var, 'ObjectName', 'Unknown'),
+                        namespace=self._get_attr(var, 'Namespace', 'User'),
+                        dtsid=self._get_attr(var, 'DTSID', ''),
+                        data_type=data_type,
+                        value=value,
+                        expression=self._get_attr(var, 'Expression'),
+                        read_only=self._get_attr(var, 'ReadOnly', 'False') == 'True'
+                    ))
 
         return variables
 
@@ -248,24 +392,23 @@ class DtsxParser:
         """Parse package parameters."""
         parameters = []
 
-        for elem in self.root.iter():
-            if 'PackageParameters' in elem.tag:
-                for param in elem:
-                    if 'PackageParameter' in param.tag:
-                        value = None
-                        for child in param:
-                            if 'Property' in child.tag and self._get_attr(child, 'Name') == 'ParameterValue':
-                                value = child.text
-                                break
-
-                        parameters.append(Parameter(
-                            name=self._get_attr(param, 'ObjectName', 'Unknown'),
-                            dtsid=self._get_attr(param, 'DTSID', ''),
-                            data_type=int(self._get_attr(param, 'DataType', 8)),
-                            value=value,
-                            sensitive=self._get_attr(param, 'Sensitive', '0') == '1',
-                            required=self._get_attr(param, 'Required', '0') == '1'
-                        ))
+        for elem in self._by_tag.get('PackageParameters', ()):
+            for param in elem:
+                if _local_name(param.tag) == 'PackageParameter':
+                    value = None
+                    for child in param:
+                        if _local_name(child.tag) == 'Property' and self._get_attr(child, 'Name') == 'ParameterValue':
+                            value = child.text
+                            break
+
+                    parameters.append(Parameter(
+                        name=self._get_attr(param, 'ObjectName', 'Unknown'),
+                        dtsid=self._get_attr(param, 'DTSID', ''),
+                        data_type=int(self._get_attr(param, 'DataType', 8)),
+                        value=value,
+                        sensitive=self._get_attr(param, 'Sensitive', '0') == '1',
+                        required=self._get_attr(param, 'Required', '0') == '1'
+                    ))
 
         return parameters
 
@@ -277,18 +420,18 @@ class DtsxParser:
 
         # Find the main Executables container
         for elem in self.root:
-            if 'Executables' in elem.tag:
+            if _local_name(elem.tag) == 'Executables':
                 for executable in elem:
-                    if 'Executable' in executable.tag:
+                    if _local_name(executable.tag) == 'Executable':
                         stage_order += 1
                         stage = self._parse_executable_as_stage(executable, stage_order)
                         stages.append(stage)
 
         # Parse main precedence constraints
         for elem in self.root:
-            if 'PrecedenceConstraints' in elem.tag:
+            if _local_name(elem.tag) == 'PrecedenceConstraints':
                 for constraint in elem:
-                    if 'PrecedenceConstraint' in constraint.tag:
+                    if _local_name(constraint.tag) == 'PrecedenceConstraint':
                         pc = self._parse_precedence_constraint(constraint)
                         all_constraints.append(pc)
 
@@ -303,23 +446,15 @@ class DtsxParser:
         creation_name = self._get_attr(elem, 'CreationName', '')
 
         # Determine stage type
-        if 'SEQUENCE' in exec_type or 'SEQUENCE' in creation_name:
-            stage_type = 'Sequence'
-        elif 'Pipeline' in exec_type or 'Pipeline' in creation_name:
-            stage_type = 'DataFlow'
-        elif 'ExecuteSQLTask' in exec_type or 'ExecuteSQLTask' in creation_name:
-            stage_type = 'SqlTask'
-        elif 'SendMailTask' in exec_type or 'SendMailTask' in creation_name:
-            stage_type = 'SendMailTask'
-        else:
-            stage_type = exec_type or creation_name or 'Unknown'
+        stage_type = (_executable_kind(exec_type, creation_name)
+                      or exec_type or creation_name or 'Unknown')
 
         # Parse child tasks
         tasks = []
         for child in elem:
-            if 'Executables' in child.tag:
+            if _local_name(child.tag) == 'Executables':
                 for task_elem in child:
-                    if 'Executable' in task_elem.tag:
+                    if _local_name(task_elem.tag) == 'Executable':
                         task_info = self._parse_task(task_elem)
                         tasks.append(task_info)
 
@@ -328,336 +463,159 @@ class DtsxParser:
             name=self._get_attr(elem, 'ObjectName', f'Stage_{order}'),
             stage_type=stage_type,
             description=self._get_attr(elem, 'Description'),
-            tasks=tasks
+            tasks=tasks,
+            ref_id=self._get_attr(elem, 'refId', '')
         )
 
-    def _parse_task(self, elem: ET.Element) -> Dict[str, Any]:
+    def _parse_task(self, elem: ET.Element) -> TaskInfo:
         """Parse a task element and return its details."""
         exec_type = self._get_attr(elem, 'ExecutableType', '')
         creation_name = self._get_attr(elem, 'CreationName', '')
 
-        task_info = {
-            'name': self._get_attr(elem, 'ObjectName', 'Unknown'),
-            'ref_id': self._get_attr(elem, 'refId', ''),
-            'dtsid': self._get_attr(elem, 'DTSID', ''),
-            'type': exec_type or creation_name,
-            'description': self._get_attr(elem, 'Description'),
-        }
-
-        # Parse SQL task specifics
-        if 'ExecuteSQLTask' in (exec_type + creation_name):
-            sql_info = self._parse_sql_task_details(elem)
-            task_info.update(sql_info)
-
-        # Parse Send Mail task specifics
-        if 'SendMailTask' in (exec_type + creation_name):
-            mail_info = self._parse_sendmail_task_details(elem)
-            task_info.update(mail_info)
-
-        return task_info
+        task = TaskInfo(
+            name=self._get_attr(elem, 'ObjectName', 'Unknown'),
+            ref_id=self._get_attr(elem, 'refId', ''),
+            dtsid=self._get_attr(elem, 'DTSID', ''),
+            task_type=exec_type or creation_name,
+            description=self._get_attr(elem, 'Description')
+        )
 
-    def _parse_sql_task_details(self, elem: ET.Element) -> Dict[str, Any]:
+        kind = _executable_kind(exec_type, creation_name)
+        if kind == 'SqlTask':
+            # Parse SQL task specifics
+            task.sql = self._parse_sql_task_details(task, self._index_subtree(elem))
+        elif kind == 'SendMailTask':
+            # Parse Send Mail task specifics
+            task.mail = self._parse_sendmail_task_details(task, self._index_subtree(elem))
+
+        return task
+
+    @staticmethod
+    def _index_subtree(elem: ET.Element) -> Dict[str, List[ET.Element]]:
+        """Index an element's subtree by local tag name in one walk."""
+        sub_index = defaultdict(list)
+        for child in elem.iter():
+            sub_index[_local_name(child.tag)].append(child)
+        return sub_index
+
+    def _parse_sql_task_details(self, task: TaskInfo,
+                                sub_index: Dict[str, List[ET.Element]]) -> SqlTask:
         """Parse SQL task specific details."""
-        details = {
-            'sql_statement': None,
-            'connection': None,
-            'result_set_type': None,
-            'parameter_bindings': [],
-            'result_bindings': []
-        }
-
-        for obj_data in elem.iter():
-            if 'SqlTaskData' in obj_data.tag:
-                # Get SQL statement
-                details['sql_statement'] = obj_data.get(
-                    f'{{{self.NAMESPACES["SQLTask"]}}}SqlStatementSource',
-                    obj_data.get('SQLTask:SqlStatementSource')
-                )
-                details['connection'] = obj_data.get(
-                    f'{{{self.NAMESPACES["SQLTask"]}}}Connection',
-                    obj_data.get('SQLTask:Connection')
-                )
-                details['result_set_type'] = obj_data.get(
-                    f'{{{self.NAMESPACES["SQLTask"]}}}ResultSetType',
-                    obj_data.get('SQLTask:ResultSetType')
-                )
-
-                # Parse parameter bindings
-                for binding in obj_data.iter():
-                    if 'ParameterBinding' in binding.tag:
-                        details['parameter_bindings'].append({
-                            'parameter_name': binding.get(
-                                f'{{{self.NAMESPACES["SQLTask"]}}}ParameterName',
-                                binding.get('SQLTask:ParameterName')
-                            ),
-                            'variable_name': binding.get(
-                                f'{{{self.NAMESPACES["SQLTask"]}}}DtsVariableName',
-                                binding.get('SQLTask:DtsVariableName')
-                            )
-                        })
-                    elif 'ResultBinding' in binding.tag:
-                        details['result_bindings'].append({
-                            'result_name': binding.get(
-                                f'{{{self.NAMESPACES["SQLTask"]}}}ResultName',
-                                binding.get('SQLTask:ResultName')
-                            ),
-                            'variable_name': binding.get(
-                                f'{{{self.NAMESPACES["SQLTask"]}}}DtsVariableName',
-                                binding.get('SQLTask:DtsVariableName')
-                            )
-                        })
+        details = SqlTask(
+            name=task.name,
+            ref_id=task.ref_id,
+            dtsid=task.dtsid,
+            description=task.description
+        )
+
+        for obj_data in sub_index.get('SqlTaskData', ()):
+            a = obj_data.attrib
+            details.sql_statement = a.get(_SQL_STATEMENT_SOURCE)
+            details.connection_ref = self._s(a.get(_SQL_CONNECTION))
+            details.result_set_type = a.get(_SQL_RESULT_SET_TYPE)
+
+        # Parse parameter bindings
+        for binding in sub_index.get('ParameterBinding', ()):
+            a = binding.attrib
+            details.parameter_bindings.append(ParameterBinding(
+                parameter_name=a.get(_SQL_PARAMETER_NAME),
+                variable_name=self._s(a.get(_SQL_VARIABLE_NAME))
+            ))
+        for binding in sub_index.get('ResultBinding', ()):
+            a = binding.attrib
+            details.result_bindings.append(ResultBinding(
+                result_name=a.get(_SQL_RESULT_NAME),
+                variable_name=self._s(a.get(_SQL_VARIABLE_NAME))
+            ))
 
         return details
 
-    def _parse_sendmail_task_details(self, elem: ET.Element) -> Dict[str, Any]:
+    def _parse_sendmail_task_details(self, task: TaskInfo,
+                                     sub_index: Dict[str, List[ET.Element]]) -> SendMailTask:
         """Parse Send Mail task specific details."""
-        details = {
-            'from_address': None,
-            'to_address': None,
-            'subject': None,
-            'message_source': None,
-            'smtp_connection': None
-        }
-
-        for obj_data in elem.iter():
-            if 'SendMailTaskData' in obj_data.tag:
-                ns_prefix = f'{{{self.NAMESPACES["SendMailTask"]}}}'
-                details['from_address'] = obj_data.get(f'{ns_prefix}From', obj_data.get('SendMailTask:From'))
-                details['to_address'] = obj_data.get(f'{ns_prefix}To', obj_data.get('SendMailTask:To'))
-                details['subject'] = obj_data.get(f'{ns_prefix}Subject', obj_data.get('SendMailTask:Subject'))
-                details['smtp_connection'] = obj_data.get(f'{ns_prefix}SMTPServer', obj_data.get('SendMailTask:SMTPServer'))
-
-                # Get message source from child element
-                for child in obj_data:
-                    if 'MessageSource' in child.tag:
-                        details['message_source'] = child.text
+        details = SendMailTask(
+            name=task.name,
+            ref_id=task.ref_id,
+            dtsid=task.dtsid,
+            description=task.description
+        )
+
+        for obj_data in sub_index.get('SendMailTaskData', ()):
+            a = obj_data.attrib
+            details.from_address = a.get(_MAIL_FROM)
+            details.to_address = a.get(_MAIL_TO)
+            details.subject = a.get(_MAIL_SUBJECT)
+            details.smtp_connection = self._s(a.get(_MAIL_SMTP_SERVER))
+
+        # Get message source from child element
+        for child in sub_index.get('MessageSource', ()):
+            details.message_source = child.text
 
         return details
 
     def _parse_precedence_constraint(self, elem: ET.Element) -> PrecedenceConstraint:
         """Parse a precedence constraint element."""
+        eval_op = self._get_attr(elem, 'EvalOp')
         return PrecedenceConstraint(
             name=self._get_attr(elem, 'ObjectName', ''),
             ref_id=self._get_attr(elem, 'refId', ''),
             dtsid=self._get_attr(elem, 'DTSID', ''),
-            from_ref=self._get_attr(elem, 'From', ''),
-            to_ref=self._get_attr(elem, 'To', ''),
+            from_ref=self._s(self._get_attr(elem, 'From', '')),
+            to_ref=self._s(self._get_attr(elem, 'To', '')),
             value=int(self._get_attr(elem, 'Value', 0)),
             logical_and=self._get_attr(elem, 'LogicalAnd', 'True') == 'True',
             expression=self._get_attr(elem, 'Expression'),
-            eval_op=int(self._get_attr(elem, 'EvalOp', 0)) if self._get_attr(elem, 'EvalOp') else None
+            eval_op=int(eval_op) if eval_op else None
         )
 
     def _link_stages_with_precedence(self, stages: List[ControlFlowStage],
                                       constraints: List[PrecedenceConstraint]) -> None:
         """Link stages with their precedence constraints."""
-        # Create lookup by ref_id
+        # Create lookups by ref_id, and by name for refs that only carry a path
         stage_by_ref = {}
+        stage_by_name = {}
         for stage in stages:
-            # Match by name in ref_id
-            for constraint in constraints:
-                if stage.name in constraint.from_ref:
-                    stage_by_ref[constraint.from_ref] = stage
-                if stage.name in constraint.to_ref:
-                    stage_by_ref[constraint.to_ref] = stage
+            if stage.ref_id:
+                stage_by_ref.setdefault(stage.ref_id, stage)
+            stage_by_name.setdefault(stage.name, stage)
+
+        def find_stage(ref: str) -> Optional[ControlFlowStage]:
+            stage = stage_by_ref.get(ref)
+            if stage is None:
+                stage = stage_by_name.get(ref.rpartition('\\')[2])
+            return stage
 
         # Set precedence information
         for constraint in constraints:
-            from_stage = stage_by_ref.get(constraint.from_ref)
-            to_stage = stage_by_ref.get(constraint.to_ref)
+            from_stage = find_stage(constraint.from_ref)
+            to_stage = find_stage(constraint.to_ref)
 
             if from_stage and constraint.to_ref not in from_stage.precedence_to:
                 from_stage.precedence_to.append(constraint.to_ref)
-                if constraint.expression:
-                    to_stage.condition = constraint.expression if to_stage else None
+                if constraint.expression and to_stage:
+                    to_stage.condition = constraint.expression
 
             if to_stage and constraint.from_ref not in to_stage.precedence_from:
                 to_stage.precedence_from.append(constraint.from_ref)
 
     def _parse_data_flow_tasks(self) -> List[DataFlowTask]:
         """Parse all data flow tasks in the package."""
-        data_flows = []
-
-        for elem in self.root.iter():
-            if 'Executable' in elem.tag:
-                exec_type = self._get_attr(elem, 'ExecutableType', '')
-                creation_name = self._get_attr(elem, 'CreationName', '')
-
-                if 'Pipeline' in exec_type or 'Pipeline' in creation_name:
-                    dft = self._parse_data_flow_task(elem)
-                    data_flows.append(dft)
-
-        return data_flows
-
-    def _parse_data_flow_task(self, elem: ET.Element) -> DataFlowTask:
-        """Parse a single data flow task."""
-        components = []
-        paths = []
-
-        # Find pipeline components
-        for obj_data in elem.iter():
-            if obj_data.tag == 'pipeline' or 'ObjectData' in obj_data.tag:
-                for pipeline in obj_data.iter():
-                    if pipeline.tag == 'pipeline':
-                        # Parse components
-                        for comp_container in pipeline:
-                            if comp_container.tag == 'components':
-                                for comp in comp_container:
-                                    if comp.tag == 'component':
-                                        component = self._parse_data_flow_component(comp)
-                                        components.append(component)
-                            elif comp_container.tag == 'paths':
-                                for path in comp_container:
-                                    if path.tag == 'path':
-                                        df_path = self._parse_data_flow_path(path)
-                                        paths.append(df_path)
-
-        return DataFlowTask(
-            name=self._get_attr(elem, 'ObjectName', 'Unknown'),
-            ref_id=self._get_attr(elem, 'refId', ''),
-            dtsid=self._get_attr(elem, 'DTSID', ''),
-            description=self._get_attr(elem, 'Description'),
-            components=components,
-            paths=paths
-        )
+        pipelines = []
 
-    def _parse_data_flow_component(self, elem: ET.Element) -> DataFlowComponent:
-        """Parse a data flow component."""
-        comp_class = elem.get('componentClassID', '')
+        for elem in self._by_tag.get('Executable', ()):
+            exec_type = self._get_attr(elem, 'ExecutableType', '')
+            creation_name = self._get_attr(elem, 'CreationName', '')
 
-        # Determine component type
-        if 'Source' in comp_class:
-            comp_type = 'Source'
-        elif 'Destination' in comp_class:
-            comp_type = 'Destination'
-        else:
-            comp_type = 'Transform'
-
-        # Parse properties
-        props = {}
-        sql_command = None
-        table_name = None
-
-        for prop_container in elem:
-            if prop_container.tag == 'properties':
-                for prop in prop_container:
-                    if prop.tag == 'property':
-                        name = prop.get('name', '')
-                        value = prop.text
-                        props[name] = value
-
-                        if name == 'SqlCommand':
-                            sql_command = value
-                        elif name == 'OpenRowset':
-                            table_name = value
-
-        # Parse output columns
-        output_columns = []
-        conditional_outputs = []
-        has_error_output = False
-
-        for outputs_container in elem:
-            if outputs_container.tag == 'outputs':
-                for output in outputs_container:
-                    if output.tag == 'output':
-                        is_error = output.get('isErrorOut', 'false').lower() == 'true'
-                        if is_error:
-                            has_error_output = True
-
-                        output_name = output.get('name', '')
-
-                        # Check for conditional split outputs
-                        for out_props in output:
-                            if out_props.tag == 'properties':
-                                expr = None
-                                friendly_expr = None
-                                eval_order = None
-                                is_default = False
-
-                                for p in out_props:
-                                    if p.tag == 'property':
-                                        pname = p.get('name', '')
-                                        if pname == 'Expression':
-                                            expr = p.text
-                                        elif pname == 'FriendlyExpression':
-                                            friendly_expr = p.text
-                                        elif pname == 'EvaluationOrder':
-                                            eval_order = int(p.text) if p.text else None
-                                        elif pname == 'IsDefaultOut':
-                                            is_default = p.text and p.text.lower() == 'true'
-
-                                if expr or is_default:
-                                    conditional_outputs.append(ConditionalOutput(
-                                        name=output_name,
-                                        expression=expr,
-                                        friendly_expression=friendly_expr,
-                                        evaluation_order=eval_order,
-                                        is_default=is_default
-                                    ))
-
-                        # Parse output columns
-                        for out_cols in output:
-                            if out_cols.tag == 'outputColumns':
-                                for col in out_cols:
-                                    if col.tag == 'outputColumn':
-                                        output_columns.append(OutputColumn(
-                                            name=col.get('name', ''),
-                                            ref_id=col.get('refId', ''),
-                                            data_type=col.get('dataType'),
-                                            length=int(col.get('length', 0)) if col.get('length') else None,
-                                            expression=col.get('expression')
-                                        ))
-
-        # Parse input columns
-        input_columns = []
-        for inputs_container in elem:
-            if inputs_container.tag == 'inputs':
-                for inp in inputs_container:
-                    if inp.tag == 'input':
-                        for inp_cols in inp:
-                            if inp_cols.tag == 'inputColumns':
-                                for col in inp_cols:
-                                    if col.tag == 'inputColumn':
-                                        input_columns.append(Column(
-                                            name=col.get('cachedName', ''),
-                                            ref_id=col.get('refId', ''),
-                                            data_type=col.get('cachedDataType'),
-                                            length=int(col.get('cachedLength', 0)) if col.get('cachedLength') else None
-                                        ))
-
-        # Get connection manager
-        conn_manager = None
-        for conns in elem:
-            if conns.tag == 'connections':
-                for conn in conns:
-                    if conn.tag == 'connection':
-                        conn_manager = conn.get('connectionManagerRefId', '')
-                        break
-
-        return DataFlowComponent(
-            name=elem.get('name', 'Unknown'),
-            ref_id=elem.get('refId', ''),
-            component_type=comp_type,
-            component_class=comp_class,
-            description=elem.get('description'),
-            input_columns=input_columns,
-            output_columns=output_columns,
-            conditional_outputs=conditional_outputs,
-            connection_manager=conn_manager,
-            sql_command=sql_command,
-            table_name=table_name,
-            properties=props,
-            has_error_output=has_error_output
-        )
+            if _executable_kind(exec_type, creation_name) == 'DataFlow':
+                pipelines.append(elem)
 
-    def _parse_data_flow_path(self, elem: ET.Element) -> DataFlowPath:
-        """Parse a data flow path."""
-        return DataFlowPath(
-            name=elem.get('name', ''),
-            ref_id=elem.get('refId', ''),
-            source_ref_id=elem.get('startId', ''),
-            destination_ref_id=elem.get('endId', '')
-        )
+        if (self.max_workers and self.max_workers > 1 and len(pipelines) > 1
+                and len(self._by_tag.get('component', ())) >= self.PARALLEL_MIN_COMPONENTS):
+            fragments = [ET.tostring(elem) for elem in pipelines]
+            with ProcessPoolExecutor(max_workers=self.max_workers) as pool:
+                return list(pool.map(_parse_pipeline_fragment, fragments))
+
+        return [_parse_data_flow_task(elem, self._strings) for elem in pipelines]
 
     def _parse_error_handling(self) -> ErrorHandlingStrategy:
         """Parse error handling configuration."""
@@ -667,23 +625,21 @@ class DtsxParser:
         logging_mode = None
 
         # Parse event handlers
-        for elem in self.root.iter():
-            if 'EventHandlers' in elem.tag:
-                for handler in elem:
-                    if 'EventHandler' in handler.tag:
-                        eh = self._parse_event_handler(handler)
-                        event_handlers.append(eh)
+        for elem in self._by_tag.get('EventHandlers', ()):
+            for handler in elem:
+                if _local_name(handler.tag) == 'EventHandler':
+                    eh = self._parse_event_handler(handler)
+                    event_handlers.append(eh)
 
         # Parse logging configuration
-        for elem in self.root.iter():
-            if 'LoggingOptions' in elem.tag:
-                for child in elem:
-                    if 'LoggingMode' in child.tag:
-                        logging_mode = child.text
-                    elif 'EventFilter' in child.tag:
-                        for event in child:
-                            if 'EventToLog' in event.tag:
-                                logged_events.append(event.text)
+        for elem in self._by_tag.get('LoggingOptions', ()):
+            for child in elem:
+                if _local_name(child.tag) == 'LoggingMode':
+                    logging_mode = child.text
+                elif _local_name(child.tag) == 'EventFilter':
+                    for event in child:
+                        if _local_name(event.tag) == 'EventToLog':
+                            logged_events.append(event.text)
 
         return ErrorHandlingStrategy(
             event_handlers=event_handlers,
@@ -694,219 +650,355 @@ class DtsxParser:
 
     def _parse_event_handler(self, elem: ET.Element) -> EventHandler:
         """Parse an event handler."""
-        executables = []
-        constraints = []
-
-        for child in elem:
-            if 'Executables' in child.tag:
-                for exec_elem in child:
-                    if 'Executable' in exec_elem.tag:
-                        task = self._parse_task(exec_elem)
-                        executables.append(task)
-            elif 'PrecedenceConstraints' in child.tag:
-                for pc_elem in child:
-                    if 'PrecedenceConstraint' in pc_elem.tag:
-                        pc = self._parse_precedence_constraint(pc_elem)
-                        constraints.append(pc)
+        executables = [self._parse_task(exec_elem)
+                       for exec_elem in elem.iterfind(_DTS_EXECUTABLES_PATH)]
+        constraints = [self._parse_precedence_constraint(pc_elem)
+                       for pc_elem in elem.iterfind(_DTS_PRECEDENCE_CONSTRAINTS_PATH)]
 
+        # Same qualified-then-plain lookup as _get_attr, without the calls
+        get = elem.attrib.get
         return EventHandler(
-            name=self._get_attr(elem, 'ObjectName', ''),
-            ref_id=self._get_attr(elem, 'refId', ''),
-            dtsid=self._get_attr(elem, 'DTSID', ''),
-            event_name=self._get_attr(elem, 'EventName', ''),
+            name=get(_DTS_OBJECT_NAME, get('ObjectName', '')),
+            ref_id=get(_DTS_REF_ID, get('refId', '')),
+            dtsid=get(_DTS_DTSID, get('DTSID', '')),
+            event_name=get(_DTS_EVENT_NAME, get('EventName', '')),
             executables=executables,
             precedence_constraints=constraints
         )
 
-    def _extract_database_objects(self) -> List[DatabaseObject]:
+    def _extract_database_objects(self, stages: List[ControlFlowStage],
+                                  data_flow_tasks: List[DataFlowTask]) -> List[DatabaseObject]:
         """Extract database objects from SQL statements in the package."""
-        objects = []
-        seen = set()
-
-        # Patterns for extracting database objects
-        patterns = {
-            'table': [
-                r'FROM\s+(\[?[\w\.]+\]?\.\[?[\w]+\]?)',
-                r'INTO\s+(\[?[\w\.]+\]?\.\[?[\w]+\]?)',
-                r'UPDATE\s+(\[?[\w\.]+\]?\.\[?[\w]+\]?)',
-                r'JOIN\s+(\[?[\w\.]+\]?\.\[?[\w]+\]?)',
-                r'INSERT\s+INTO\s+(\[?[\w\.]+\]?\.\[?[\w]+\]?)',
-            ],
-            'procedure': [
-                r'EXEC(?:UTE)?\s+(\[?[\w\.]+\]?\.\[?[\w]+\]?)',
-            ],
-            'function': [
-                r'(\[?[\w\.]+\]?\.\[?fn_\w+\]?)\s*\(',
-            ]
-        }
-
-        # Collect all SQL statements
-        sql_statements = []
-
-        for stage in self.package.control_flow_stages if self.package else []:
+        table_refs = [(comp.table_name, comp.component_type)
+                      for dft in data_flow_tasks
+                      for comp in dft.components
+                      if comp.table_name]
+        statements = list(self._iter_sql_statements(stages, data_flow_tasks))
+
+        # (object_type, schema, name) -> usage of the first reference
+        seen: Dict[Tuple[str, str, str], str] = {}
+
+        def add(raw: str, object_type: str, usage: str) -> None:
+            schema, obj_name = _split_qualified(raw)
+            # Schemas repeat heavily; interned keys hash and compare by identity
+            schema = sys.intern(schema)
+            seen.setdefault((object_type, schema, obj_name), usage)
+
+        # Direct table references come first, ahead of anything found in SQL
+        for table_name, usage in table_refs:
+            add(table_name, 'Table', usage)
+
+        if (self.max_workers and self.max_workers > 1
+                and len(statements) >= self.PARALLEL_MIN_STATEMENTS):
+            # Batches are mapped in order, so first-seen usage is unchanged
+            batches = [statements[k:k + self.SQL_BATCH_SIZE]
+                       for k in range(0, len(statements), self.SQL_BATCH_SIZE)]
+            with ProcessPoolExecutor(max_workers=self.max_workers) as pool:
+                for references in pool.map(_find_sql_references, batches):
+                    for raw, object_type, usage in references:
+                        add(raw, object_type, usage)
+        else:
+            for raw, object_type, usage in _find_sql_references(statements):
+                add(raw, object_type, usage)
+
+        return [DatabaseObject(name=obj_name, object_type=object_type, schema=schema, usage=usage)
+                for (object_type, schema, obj_name), usage in seen.items()]
+
+    @staticmethod
+    def _iter_sql_statements(stages: List[ControlFlowStage],
+                             data_flow_tasks: List[DataFlowTask]):
+        """Yield (sql, usage) for every non-empty task and component SQL text."""
+        for stage in stages:
             for task in stage.tasks:
-                if task.get('sql_statement'):
-                    sql_statements.append((task.get('sql_statement'), task.get('name'), 'Task'))
+                sql_statement = task.sql_statement
+                if sql_statement:
+                    yield sql_statement, 'Task'
 
-        for dft in self.package.data_flow_tasks if self.package else []:
+        for dft in data_flow_tasks:
             for comp in dft.components:
                 if comp.sql_command:
-                    sql_statements.append((comp.sql_command, comp.name, comp.component_type))
-                if comp.table_name:
-                    # Direct table reference
-                    name = comp.table_name.strip('[]')
-                    if '.' in name:
-                        parts = name.split('.')
-                        schema = parts[0].strip('[]')
-                        table = parts[1].strip('[]')
-                    else:
-                        schema = 'dbo'
-                        table = name
-
-                    key = f"{schema}.{table}"
-                    if key not in seen:
-                        seen.add(key)
-                        objects.append(DatabaseObject(
-                            name=table,
-                            object_type='Table',
-                            schema=schema,
-                            usage=comp.component_type
-                        ))
-
-        # Parse SQL statements for objects
-        for sql, source_name, usage in sql_statements:
-            if not sql:
-                continue
-
-            # Extract tables
-            for pattern in patterns['table']:
-                matches = re.findall(pattern, sql, re.IGNORECASE)
-                for match in matches:
-                    name = match.strip('[]')
-                    if '.' in name:
-                        parts = name.split('.')
-                        schema = parts[0].strip('[]')
-                        table = parts[1].strip('[]')
-                    else:
-                        schema = 'dbo'
-                        table = name
-
-                    key = f"{schema}.{table}"
-                    if key not in seen:
-                        seen.add(key)
-                        objects.append(DatabaseObject(
-                            name=table,
-                            object_type='Table',
-                            schema=schema,
-                            usage=usage
-                        ))
-
-            # Extract stored procedures
-            for pattern in patterns['procedure']:
-                matches = re.findall(pattern, sql, re.IGNORECASE)
-                for match in matches:
-                    name = match.strip('[]')
-                    if '.' in name:
-                        parts = name.split('.')
-                        schema = parts[0].strip('[]')
-                        proc = parts[1].strip('[]')
-                    else:
-                        schema = 'dbo'
-                        proc = name
-
-                    key = f"proc:{schema}.{proc}"
-                    if key not in seen:
-                        seen.add(key)
-                        objects.append(DatabaseObject(
-                            name=proc,
-                            object_type='StoredProcedure',
-                            schema=schema,
-                            usage='Execute'
-                        ))
-
-            # Extract functions
-            for pattern in patterns['function']:
-                matches = re.findall(pattern, sql, re.IGNORECASE)
-                for match in matches:
-                    name = match.strip('[]')
-                    if '.' in name:
-                        parts = name.split('.')
-                        schema = parts[0].strip('[]')
-                        func = parts[1].strip('[]')
-                    else:
-                        schema = 'dbo'
-                        func = name
-
-                    key = f"func:{schema}.{func}"
-                    if key not in seen:
-                        seen.add(key)
-                        objects.append(DatabaseObject(
-                            name=func,
-                            object_type='Function',
-                            schema=schema,
-                            usage='Reference'
-                        ))
-
-        return objects
+                    yield comp.sql_command, comp.component_type
 
     def _extract_thresholds(self, variables: List[Variable]) -> List[Threshold]:
         """Extract threshold values from variables."""
         thresholds = []
 
-        # Known threshold variable patterns
-        threshold_patterns = {
-            'Threshold': 'General',
-            'Limit': 'General',
-            'Max': 'Performance',
-            'Min': 'Performance',
-            'Score': 'Fraud',
-            'Window': 'Time',
-            'Batch': 'Performance',
-            'Fraud': 'Fraud',
-            'Compliance': 'Compliance'
-        }
-
         for var in variables:
-            for pattern, category in threshold_patterns.items():
-                if pattern.lower() in var.name.lower():
-                    thresholds.append(Threshold(
-                        name=var.name,
-                        value=var.value,
-                        data_type=str(var.data_type),
-                        category=category,
-                        description=f"Variable from namespace {var.namespace}"
-                    ))
-                    break
+            # One scan finds every fragment; the highest-priority one decides
+            best = min((_THRESHOLD_RANKS[m.group(1)] for m in _THRESHOLD_RE.finditer(var.name.lower())),
+                       default=None)
+            if best is not None:
+                _, category = best
+                thresholds.append(Threshold(
+                    name=var.name,
+                    value=var.value,
+                    data_type=str(var.data_type),
+                    category=category,
+                    description=f"Variable from namespace {var.namespace}"
+                ))
 
         return thresholds
 
-    def _extract_alerts(self) -> List[Alert]:
+    def _extract_alerts(self, stages: List[ControlFlowStage],
+                        error_handling: Optional[ErrorHandlingStrategy]) -> List[Alert]:
         """Extract alert configurations from the package."""
         alerts = []
 
         # Look for send mail tasks and error handlers
-        if self.package and self.package.error_handling:
-            for handler in self.package.error_handling.event_handlers:
+        if error_handling is not None:
+            for handler in error_handling.event_handlers:
                 for task in handler.executables:
-                    if 'SendMailTask' in task.get('type', ''):
+                    if task.is_send_mail:
                         alerts.append(Alert(
-                            name=task.get('name', 'Unknown Alert'),
+                            name=task.name,
                             alert_type=handler.event_name,
-                            recipients=task.get('to_address'),
-                            priority='High' if 'Error' in handler.event_name else 'Normal',
-                            category='Error' if 'Error' in handler.event_name else 'Warning'
+                            recipients=task.to_address,
+                            priority='High' if handler.is_error else 'Normal',
+                            category='Error' if handler.is_error else 'Warning'
                         ))
 
         # Look for completion notifications
-        for stage in self.package.control_flow_stages if self.package else []:
+        for stage in stages:
             for task in stage.tasks:
-                if 'SendMailTask' in task.get('type', ''):
+                if task.is_send_mail:
                     alerts.append(Alert(
-                        name=task.get('name', 'Unknown Alert'),
+                        name=task.name,
                         alert_type='Completion',
-                        recipients=task.get('to_address'),
+                        recipients=task.to_address,
                         priority='Normal',
                         category='Notification'
                     ))
 
         return alerts
+
+
+# Data flow parsing is module-level so worker processes can run it on a
+# serialized pipeline without a parser instance.
+def _parse_data_flow_task(elem: ET.Element, strings: Dict[str, str]) -> DataFlowTask:
+    """Parse a single data flow task, sharing repeated strings through ``strings``."""
+    components = []
+    paths = []
+
+    # Find pipeline components
+    pipeline = elem.find('.//pipeline')
+    if pipeline is not None:
+        for container in pipeline:
+            if container.tag == 'components':
+                for comp in container:
+                    if comp.tag == 'component':
+                        components.append(_parse_data_flow_component(comp, strings))
+            elif container.tag == 'paths':
+                for path in container:
+                    if path.tag == 'path':
+                        paths.append(_parse_data_flow_path(path))
+
+    return DataFlowTask(
+        name=_get_dts_attr(elem, 'ObjectName', 'Unknown'),
+        ref_id=_get_dts_attr(elem, 'refId', ''),
+        dtsid=_get_dts_attr(elem, 'DTSID', ''),
+        description=_get_dts_attr(elem, 'Description'),
+        components=components,
+        paths=paths
+    )
+
+
+def _parse_data_flow_component(elem: ET.Element, strings: Dict[str, str]) -> DataFlowComponent:
+    """Parse a data flow component."""
+    a = elem.attrib
+    comp_class = a.get('componentClassID', '')
+
+    # Determine component type
+    if 'Source' in comp_class:
+        comp_type = 'Source'
+    elif 'Destination' in comp_class:
+        comp_type = 'Destination'
+    else:
+        comp_type = 'Transform'
+
+    props = {}
+    output_columns = []
+    conditional_outputs = []
+    input_columns = []
+    has_error_output = False
+    conn_manager = None
+
+    # Single pass over the component's child containers
+    for child in elem:
+        tag = child.tag
+        if tag == 'properties':
+            _parse_component_properties(child, props)
+        elif tag == 'outputs':
+            if _parse_component_outputs(child, output_columns, conditional_outputs, strings):
+                has_error_output = True
+        elif tag == 'inputs':
+            _parse_component_inputs(child, input_columns, strings)
+        elif tag == 'connections':
+            for conn in child:
+                if conn.tag == 'connection':
+                    conn_manager = _share(strings, conn.get('connectionManagerRefId', ''))
+                    break
+
+    return DataFlowComponent(
+        name=a.get('name', 'Unknown'),
+        ref_id=a.get('refId', ''),
+        component_type=comp_type,
+        component_class=comp_class,
+        description=a.get('description'),
+        input_columns=input_columns,
+        output_columns=output_columns,
+        conditional_outputs=conditional_outputs,
+        connection_manager=conn_manager,
+        sql_command=props.get('SqlCommand'),
+        table_name=props.get('OpenRowset'),
+        properties=props,
+        has_error_output=has_error_output
+    )
+
+
+def _parse_component_properties(container: ET.Element, props: Dict[str, Any]) -> None:
+    """Collect a component's custom properties into props."""
+    for prop in container:
+        if prop.tag == 'property':
+            props[prop.get('name', '')] = prop.text
+
+
+def _parse_component_outputs(container: ET.Element, output_columns: List[OutputColumn],
+                             conditional_outputs: List[ConditionalOutput],
+                             strings: Dict[str, str]) -> bool:
+    """Parse a component's outputs; return True if any is an error output."""
+    has_error_output = False
+
+    for output in container:
+        if output.tag != 'output':
+            continue
+        if output.get('isErrorOut', 'false').lower() == 'true':
+            has_error_output = True
+
+        output_name = output.get('name', '')
+
+        for child in output:
+            if child.tag == 'properties':
+                # Check for conditional split outputs
+                expr = None
+                friendly_expr = None
+                eval_order = None
+                is_default = False
+
+                for p in child:
+                    if p.tag == 'property':
+                        pname = p.get('name', '')
+                        if pname == 'Expression':
+                            expr = p.text
+                        elif pname == 'FriendlyExpression':
+                            friendly_expr = p.text
+                        elif pname == 'EvaluationOrder':
+                            eval_order = int(p.text) if p.text else None
+                        elif pname == 'IsDefaultOut':
+                            is_default = p.text and p.text.lower() == 'true'
+
+                if expr or is_default:
+                    conditional_outputs.append(ConditionalOutput(
+                        name=output_name,
+                        expression=expr,
+                        friendly_expression=friendly_expr,
+                        evaluation_order=eval_order,
+                        is_default=is_default
+                    ))
+            elif child.tag == 'outputColumns':
+                for col in child:
+                    if col.tag == 'outputColumn':
+                        a = col.attrib
+                        length = a.get('length')
+                        output_columns.append(OutputColumn(
+                            name=a.get('name', ''),
+                            ref_id=a.get('refId', ''),
+                            data_type=_share(strings, a.get('dataType')),
+                            length=int(length) if length else None,
+                            expression=a.get('expression')
+                        ))
+
+    return has_error_output
+
+
+def _parse_component_inputs(container: ET.Element, input_columns: List[Column],
+                            strings: Dict[str, str]) -> None:
+    """Collect the input columns of a component's inputs."""
+    for inp in container:
+        if inp.tag == 'input':
+            for inp_cols in inp:
+                if inp_cols.tag == 'inputColumns':
+                    for col in inp_cols:
+                        if col.tag == 'inputColumn':
+                            a = col.attrib
+                            length = a.get('cachedLength')
+                            input_columns.append(Column(
+                                name=a.get('cachedName', ''),
+                                ref_id=a.get('refId', ''),
+                                data_type=_share(strings, a.get('cachedDataType')),
+                                length=int(length) if length else None
+                            ))
+
+
+def _parse_data_flow_path(elem: ET.Element) -> DataFlowPath:
+    """Parse a data flow path."""
+    a = elem.attrib
+    return DataFlowPath(
+        name=a.get('name', ''),
+        ref_id=a.get('refId', ''),
+        source_ref_id=a.get('startId', ''),
+        destination_ref_id=a.get('endId', '')
+    )
+
+
+def _parse_pipeline_fragment(xml_bytes: bytes) -> DataFlowTask:
+    """Parse one serialized pipeline executable in a worker process."""
+    return _parse_data_flow_task(ET.fromstring(xml_bytes), {})
+
+
+def _function_call_in_name(text: str, start: int, name: str) -> Optional[str]:
+    """Return the leftmost function call starting inside a table or procedure name."""
+    # A call can only start at the name, at a '[' or right after a ']'
+    for i, ch in enumerate(name):
+        if i == 0 or ch == '[' or name[i - 1] == ']':
+            match = _FUNCTION_CALL_RE.match(text, start + i)
+            if match is not None:
+                return match.group('function')
+    return None
+
+
+def _find_sql_references(statements: List[Tuple[str, str]]) -> List[Tuple[str, str, str]]:
+    """Return (raw name, object_type, usage) for each SQL object reference, in order."""
+    references = []
+    if not statements:
+        return references
+
+    # Scan all SQL in one pass; no pattern can match across the separator
+    usages = []
+    offsets = []
+    chunks = []
+    end = 0
+    for sql, usage in statements:
+        usages.append(usage)
+        offsets.append(end)
+        chunks.append(sql)
+        end += len(sql) + len(_SQL_SEPARATOR)
+
+    text = _SQL_SEPARATOR.join(chunks)
+    for match in _SQL_OBJECT_RE.finditer(text):
+        table = match.group('table')
+        if table is not None:
+            references.append((table, 'Table', usages[bisect_right(offsets, match.start()) - 1]))
+            function = _function_call_in_name(text, match.start('table'), table)
+            if function is not None:
+                references.append((function, 'Function', 'Reference'))
+            continue
+        procedure = match.group('procedure')
+        if procedure is not None:
+            references.append((procedure, 'StoredProcedure', 'Execute'))
+            function = _function_call_in_name(text, match.start('procedure'), procedure)
+            if function is not None:
+                references.append((function, 'Function', 'Reference'))
+            continue
+        references.append((match.group('function'), 'Function', 'Reference'))
+
+    return references
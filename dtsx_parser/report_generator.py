@@ -11,748 +11,951 @@ Generates comprehensive reports including:
 - Critical thresholds and alerts
 """
 
+import io
 import json
-from typing import Optional
+import os
+from functools import cached_property
+from operator import attrgetter
+from typing import Any, Callable, Dict, Iterator, List, Optional, TextIO
 from datetime import datetime
 from pathlib import Path
 
-from .models import DtsxPackage
+from .models import (
+    Alert, ConnectionManager, ControlFlowStage, DatabaseObject, DataFlowComponent,
+    DataFlowTask, DtsxPackage, ErrorHandlingStrategy, EventHandler, PackageMetadata,
+    Parameter, TaskInfo, Threshold, Variable, sql_preview,
+)
 from .diagram_generator import DiagramGenerator
 
 
+_TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+# File extension per report format, in the order save_all_formats writes them
+_REPORT_EXTENSIONS = {'text': '.txt', 'markdown': '.md', 'json': '.json'}
+
+
+def _truncate(text: str, limit: int) -> str:
+    """Cut text to ``limit`` characters, marking a cut with '...'."""
+    head = text[:limit]
+    return head + '...' if len(text) > limit else head
+
+
+def _value_or_na(value: Any, limit: int) -> str:
+    """Stringify a value cut to ``limit`` characters, or 'N/A' when falsy."""
+    if not value:
+        return 'N/A'
+    return (value if type(value) is str else str(value))[:limit]
+
+
+# Static markdown blocks: section headings and table header rows
+_MD_TOC = (
+    "## Table of Contents\n\n"
+    "1. [Package Configuration](#package-configuration)\n"
+    "2. [Control Flow Stages](#control-flow-stages)\n"
+    "3. [Data Flow Transformations](#data-flow-transformations)\n"
+    "4. [Error Handling Strategy](#error-handling-strategy)\n"
+    "5. [Database Objects](#database-objects)\n"
+    "6. [Data Flow Diagrams](#data-flow-diagrams)\n"
+    "7. [Critical Thresholds and Alerts](#critical-thresholds-and-alerts)\n"
+    "\n"
+)
+_MD_METADATA_HEADER = (
+    "## Package Configuration\n\n"
+    "### Metadata\n\n"
+    "| Property | Value |\n"
+    "|----------|-------|\n"
+)
+_MD_CONNECTIONS_HEADER = (
+    "### Connection Managers\n\n"
+    "| Name | Type | Server | Database |\n"
+    "|------|------|--------|----------|\n"
+)
+_MD_VARIABLES_HEADER = (
+    "### Package Variables\n\n"
+    "| Name | Namespace | Data Type | Value |\n"
+    "|------|-----------|-----------|-------|\n"
+)
+_MD_PARAMETERS_HEADER = (
+    "### Package Parameters\n\n"
+    "| Name | Data Type | Value | Sensitive |\n"
+    "|------|-----------|-------|-----------|\n"
+)
+_MD_CONTROL_FLOW_HEADER = (
+    "## Control Flow Stages\n\n"
+    "### Execution Order\n\n"
+)
+_MD_COMPONENTS_HEADER = (
+    "#### Components\n\n"
+    "| Component | Type | Class | Description |\n"
+    "|-----------|------|-------|-------------|\n"
+)
+_MD_TABLES_HEADER = (
+    "## Database Objects\n\n"
+    "### Tables\n\n"
+    "| Schema | Name | Usage |\n"
+    "|--------|------|-------|\n"
+)
+_MD_PROCEDURES_HEADER = (
+    "### Stored Procedures\n\n"
+    "| Schema | Name | Usage |\n"
+    "|--------|------|-------|\n"
+)
+_MD_FUNCTIONS_HEADER = (
+    "### Functions\n\n"
+    "| Schema | Name | Usage |\n"
+    "|--------|------|-------|\n"
+)
+_MD_ASCII_DETAILS_OPEN = (
+    "<details>\n"
+    "<summary>ASCII Diagram</summary>\n\n"
+    "```\n"
+)
+_MD_ASCII_DETAILS_CLOSE = (
+    "```\n"
+    "</details>\n\n"
+)
+_MD_EXECUTION_ORDER_HEADER = (
+    "### Execution Order Diagram\n\n"
+    "```\n"
+)
+_MD_ROUTING_HEADER = (
+    "### Data Routing Logic\n\n"
+    "```\n"
+)
+_MD_THRESHOLDS_HEADER = (
+    "## Critical Thresholds and Alerts\n\n"
+    "### Thresholds\n\n"
+    "| Name | Value | Category | Data Type |\n"
+    "|------|-------|----------|-----------|\n"
+)
+_MD_ALERTS_HEADER = (
+    "### Alerts\n\n"
+    "| Name | Type | Category | Priority | Recipients |\n"
+    "|------|------|----------|----------|------------|\n"
+)
+
+
+# Static text-report rules and column header rows
+_BAR_80 = "=" * 80 + "\n"
+_BAR_70 = "=" * 70 + "\n"
+_BAR_60 = "=" * 60 + "\n"
+_DASH_40 = "-" * 40 + "\n"
+_DASH_50 = "-" * 50 + "\n"
+_DASH_60 = "-" * 60 + "\n"
+_TEXT_VARIABLES_COLUMNS = (
+    f"  {'Name':<30} {'Namespace':<10} {'Type':<6} {'Value':<30}\n"
+    f"  {'-'*30} {'-'*10} {'-'*6} {'-'*30}\n"
+)
+_TEXT_PARAMETERS_COLUMNS = (
+    f"  {'Name':<25} {'Type':<6} {'Sensitive':<10} {'Value':<30}\n"
+    f"  {'-'*25} {'-'*6} {'-'*10} {'-'*30}\n"
+)
+_TEXT_OBJECTS_COLUMNS = (
+    f"  {'Schema':<15} {'Name':<35} {'Usage':<15}\n"
+    f"  {'-'*15} {'-'*35} {'-'*15}\n"
+)
+_TEXT_THRESHOLDS_COLUMNS = (
+    f"  {'Name':<30} {'Value':<15} {'Category':<15}\n"
+    f"  {'-'*30} {'-'*15} {'-'*15}\n"
+)
+_TEXT_ALERTS_COLUMNS = (
+    f"  {'Name':<30} {'Type':<15} {'Priority':<10} {'Category':<10}\n"
+    f"  {'-'*30} {'-'*15} {'-'*10} {'-'*10}\n"
+)
+
+
+def _package_json(pkg: DtsxPackage) -> dict:
+    """Top-level report object."""
+    return {
+        'metadata': pkg.metadata,
+        'connection_managers': pkg.connection_managers,
+        'variables': pkg.variables,
+        'parameters': pkg.parameters,
+        'control_flow_stages': pkg.control_flow_stages,
+        'data_flow_tasks': pkg.data_flow_tasks,
+        'error_handling': pkg.error_handling or {
+            'logging_mode': None,
+            'logged_events': [],
+            'event_handlers': []
+        },
+        'database_objects': pkg.database_objects,
+        'thresholds': pkg.thresholds,
+        'alerts': pkg.alerts
+    }
+
+
+def _metadata_json(m: PackageMetadata) -> dict:
+    """Package metadata object."""
+    return {
+        'name': m.name,
+        'dtsid': m.dtsid,
+        'creation_date': m.creation_date,
+        'creator_name': m.creator_name,
+        'version_build': m.version_build,
+        'package_format_version': m.package_format_version
+    }
+
+
+def _stage_json(s: ControlFlowStage) -> dict:
+    """Control flow stage object."""
+    return {
+        'order': s.order,
+        'name': s.name,
+        'type': s.stage_type,
+        'description': s.description,
+        'condition': s.condition,
+        'tasks': s.tasks
+    }
+
+
+def _data_flow_task_json(dft: DataFlowTask) -> dict:
+    """Data flow task object."""
+    return {
+        'name': dft.name,
+        'description': dft.description,
+        'components': dft.components,
+        # Paths are named tuples, which JSON would otherwise write as arrays
+        'paths': [
+            {
+                'name': p.name,
+                'source': p.source_ref_id,
+                'destination': p.destination_ref_id
+            }
+            for p in dft.paths
+        ]
+    }
+
+
+def _component_json(c: DataFlowComponent) -> dict:
+    """Data flow component object."""
+    return {
+        'name': c.name,
+        'type': c.component_type,
+        'class': c.component_class,
+        'sql_command': c.sql_command,
+        'table_name': c.table_name,
+        'output_columns': [
+            {'name': col.name, 'expression': col.expression}
+            for col in c.output_columns
+        ],
+        'conditional_outputs': [
+            {
+                'name': co.name,
+                'expression': co.expression,
+                'is_default': co.is_default
+            }
+            for co in c.conditional_outputs
+        ]
+    }
+
+
+def _error_handling_json(eh: ErrorHandlingStrategy) -> dict:
+    """Error handling object."""
+    return {
+        'logging_mode': eh.logging_mode,
+        'logged_events': eh.logged_events,
+        'event_handlers': eh.event_handlers
+    }
+
+
+_JSON_SHAPES: Dict[type, Callable[[Any], dict]] = {
+    DtsxPackage: _package_json,
+    PackageMetadata: _metadata_json,
+    ConnectionManager: lambda c: {
+        'name': c.name,
+        'type': c.connection_type,
+        'server': c.server,
+        'database': c.database
+    },
+    Variable: lambda v: {
+        'name': v.name,
+        'namespace': v.namespace,
+        'data_type': v.data_type,
+        'value': v.value
+    },
+    Parameter: lambda p: {
+        'name': p.name,
+        'data_type': p.data_type,
+        'value': p.value,
+        'sensitive': p.sensitive
+    },
+    ControlFlowStage: _stage_json,
+    TaskInfo: TaskInfo.to_dict,
+    DataFlowTask: _data_flow_task_json,
+    DataFlowComponent: _component_json,
+    ErrorHandlingStrategy: _error_handling_json,
+    EventHandler: lambda h: {'event_name': h.event_name, 'tasks': h.executables},
+    DatabaseObject: lambda o: {
+        'name': o.name,
+        'type': o.object_type,
+        'schema': o.schema,
+        'usage': o.usage
+    },
+    Threshold: lambda t: {
+        'name': t.name,
+        'value': t.value,
+        'category': t.category,
+        'data_type': t.data_type
+    },
+    Alert: lambda a: {
+        'name': a.name,
+        'type': a.alert_type,
+        'category': a.category,
+        'priority': a.priority,
+        'recipients': a.recipients
+    },
+}
+
+
+
+def _json_data(o: Any) -> Any:
+    """Convert package models, and the lists and dicts holding them, to report data."""
+    shape = _JSON_SHAPES.get(type(o))
+    if shape is not None:
+        o = shape(o)
+    if type(o) is dict:
+        return {key: _json_data(value) for key, value in o.items()}
+    if type(o) is list:
+        return [_json_data(item) for item in o]
+    return o
+
+
 class ReportGenerator:
     """Generates comprehensive reports from parsed DTSX packages."""
 
     def __init__(self, package: DtsxPackage):
         """Initialize with a parsed DTSX package."""
         self.package = package
-        self.diagram_gen = DiagramGenerator(package)
 
-    def generate_full_report(self, output_format: str = 'text') -> str:
+    @cached_property
+    def diagram_gen(self) -> DiagramGenerator:
+        """Diagram generator, created on first use; JSON reports never need it."""
+        return DiagramGenerator(self.package)
+
+    @cached_property
+    def _database_objects_by_type(self) -> Dict[str, List[DatabaseObject]]:
+        """Database objects grouped by object_type, built on first use."""
+        return self.package.database_objects_by_type()
+
+    @cached_property
+    def _stages_in_order(self) -> List[ControlFlowStage]:
+        """Control flow stages sorted by execution order, shared by the report formats."""
+        return sorted(self.package.control_flow_stages, key=attrgetter('order'))
+
+    @cached_property
+    def _execution_order_diagram(self) -> str:
+        """Execution order diagram, shared by the text and Markdown reports."""
+        return self.diagram_gen.generate_execution_order_diagram()
+
+    @cached_property
+    def _routing_logic_diagram(self) -> str:
+        """Routing logic diagram, shared by the text and Markdown reports."""
+        return self.diagram_gen.generate_routing_logic_diagram()
+
+    def generate_full_report(self, output_format: str = 'text', pretty: bool = False) -> str:
         """Generate a complete report in the specified format."""
+        buf = io.StringIO()
+        self.write_full_report(buf, output_format, pretty)
+        return buf.getvalue().removesuffix('\n')
+
+    def write_full_report(self, out: TextIO, output_format: str = 'text',
+                          pretty: bool = False) -> None:
+        """Write a complete report, ending in a newline, to a text stream.
+
+        JSON is compact by default; ``pretty=True`` indents it for people
+        reading or diffing reports. Text and Markdown ignore the flag.
+        """
         if output_format == 'json':
-            return self._generate_json_report()
-        elif output_format == 'markdown':
-            return self._generate_markdown_report()
-        else:
-            return self._generate_text_report()
-
-    def _generate_text_report(self) -> str:
-        """Generate a plain text report."""
-        sections = []
-
-        sections.append(self._generate_header())
-        sections.append(self._generate_package_configuration())
-        sections.append(self._generate_control_flow_section())
-        sections.append(self._generate_data_flow_section())
-        sections.append(self._generate_error_handling_section())
-        sections.append(self._generate_database_objects_section())
-        sections.append(self._generate_diagrams_section())
-        sections.append(self._generate_thresholds_alerts_section())
-
-        return '\n\n'.join(sections)
-
-    def _generate_markdown_report(self) -> str:
-        """Generate a Markdown report."""
-        lines = []
-
-        # Header
-        lines.append(f"# DTSX Package Analysis: {self.package.metadata.name}")
-        lines.append(f"\n*Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}*\n")
+            out.write(self._generate_json_report(pretty))
+            out.write('\n')
+            return
+        separator = '\n' if output_format != 'markdown' else ''
+        for i, write_section in enumerate(self._section_writers(output_format)):
+            if i and separator:
+                out.write(separator)
+            write_section(out.write)
+
+    def iter_full_report(self, output_format: str = 'text',
+                         pretty: bool = False) -> Iterator[str]:
+        """Yield a complete report chunk by chunk, one section at a time.
+
+        The chunks join to the text written by ``write_full_report``, so
+        callers can stream a large report without holding all of it.
+        """
+        if output_format == 'json':
+            yield self._generate_json_report(pretty) + '\n'
+            return
+        separator = '\n' if output_format != 'markdown' else ''
+        for i, write_section in enumerate(self._section_writers(output_format)):
+            parts: List[str] = []
+            if i and separator:
+                parts.append(separator)
+            write_section(parts.append)
+            yield ''.join(parts)
+
+    def _section_writers(self, output_format: str) -> tuple:
+        """Section writers for the text or Markdown report, in report order."""
+        if output_format == 'markdown':
+            return (
+                self._write_md_header,
+                self._write_md_package_configuration,
+                self._write_md_control_flow_section,
+                self._write_md_data_flow_section,
+                self._write_md_error_handling_section,
+                self._write_md_database_objects_section,
+                self._write_md_diagrams_section,
+                self._write_md_thresholds_alerts_section,
+            )
+        return (
+            self._write_header,
+            self._write_package_configuration,
+            self._write_control_flow_section,
+            self._write_data_flow_section,
+            self._write_error_handling_section,
+            self._write_database_objects_section,
+            self._write_diagrams_section,
+            self._write_thresholds_alerts_section,
+        )
+
+    def _write_md_header(self, w: Callable[[str], None]) -> None:
+        """Generate Markdown title and table of contents."""
+        metadata = self.package.metadata
+        generated = datetime.now().strftime(_TIMESTAMP_FORMAT)
+
+        w(f"# DTSX Package Analysis: {metadata.name}\n")
+        w(f"\n*Generated on: {generated}*\n\n")
 
         # Table of Contents
-        lines.append("## Table of Contents\n")
-        lines.append("1. [Package Configuration](#package-configuration)")
-        lines.append("2. [Control Flow Stages](#control-flow-stages)")
-        lines.append("3. [Data Flow Transformations](#data-flow-transformations)")
-        lines.append("4. [Error Handling Strategy](#error-handling-strategy)")
-        lines.append("5. [Database Objects](#database-objects)")
-        lines.append("6. [Data Flow Diagrams](#data-flow-diagrams)")
-        lines.append("7. [Critical Thresholds and Alerts](#critical-thresholds-and-alerts)")
-        lines.append("")
-
-        # Package Configuration
-        lines.append("## Package Configuration\n")
-        lines.append("### Metadata\n")
-        lines.append(f"| Property | Value |")
-        lines.append(f"|----------|-------|")
-        lines.append(f"| Package Name | {self.package.metadata.name} |")
-        lines.append(f"| DTSID | {self.package.metadata.dtsid} |")
-        lines.append(f"| Creation Date | {self.package.metadata.creation_date or 'N/A'} |")
-        lines.append(f"| Creator | {self.package.metadata.creator_name or 'N/A'} |")
-        lines.append(f"| Version | {self.package.metadata.version_build or 'N/A'} |")
-        lines.append(f"| Format Version | {self.package.metadata.package_format_version or 'N/A'} |")
-        lines.append("")
+        w(_MD_TOC)
+
+    def _write_md_package_configuration(self, w: Callable[[str], None]) -> None:
+        """Generate Markdown package configuration tables."""
+        metadata = self.package.metadata
+
+        w(_MD_METADATA_HEADER)
+        w(f"| Package Name | {metadata.name} |\n")
+        w(f"| DTSID | {metadata.dtsid} |\n")
+        w(f"| Creation Date | {metadata.creation_date or 'N/A'} |\n")
+        w(f"| Creator | {metadata.creator_name or 'N/A'} |\n")
+        w(f"| Version | {metadata.version_build or 'N/A'} |\n")
+        w(f"| Format Version | {metadata.package_format_version or 'N/A'} |\n")
+        w("\n")
 
         # Connection Managers
-        lines.append("### Connection Managers\n")
-        lines.append("| Name | Type | Server | Database |")
-        lines.append("|------|------|--------|----------|")
-        for conn in self.package.connection_managers:
-            lines.append(f"| {conn.name} | {conn.connection_type} | {conn.server or 'N/A'} | {conn.database or 'N/A'} |")
-        lines.append("")
+        w(_MD_CONNECTIONS_HEADER)
+        w(''.join(
+            f"| {conn.name} | {conn.connection_type} | {conn.server or 'N/A'} | {conn.database or 'N/A'} |\n"
+            for conn in self.package.connection_managers
+        ))
+        w("\n")
 
         # Variables
-        lines.append("### Package Variables\n")
-        lines.append("| Name | Namespace | Data Type | Value |")
-        lines.append("|------|-----------|-----------|-------|")
+        w(_MD_VARIABLES_HEADER)
         for var in self.package.variables:
-            value = str(var.value)[:50] if var.value else 'N/A'
-            lines.append(f"| {var.name} | {var.namespace} | {var.data_type} | {value} |")
-        lines.append("")
+            value = _value_or_na(var.value, 50)
+            w(f"| {var.name} | {var.namespace} | {var.data_type} | {value} |\n")
+        w("\n")
 
         # Parameters
         if self.package.parameters:
-            lines.append("### Package Parameters\n")
-            lines.append("| Name | Data Type | Value | Sensitive |")
-            lines.append("|------|-----------|-------|-----------|")
-            for param in self.package.parameters:
-                lines.append(f"| {param.name} | {param.data_type} | {param.value or 'N/A'} | {'Yes' if param.sensitive else 'No'} |")
-            lines.append("")
-
-        # Control Flow
-        lines.append("## Control Flow Stages\n")
-        lines.append("### Execution Order\n")
-        for stage in self.package.control_flow_stages:
-            lines.append(f"#### Stage {stage.order}: {stage.name}\n")
-            lines.append(f"- **Type:** {stage.stage_type}")
+            w(_MD_PARAMETERS_HEADER)
+            w(''.join(
+                f"| {param.name} | {param.data_type} | {param.value or 'N/A'} | {'Yes' if param.sensitive else 'No'} |\n"
+                for param in self.package.parameters
+            ))
+            w("\n")
+
+    def _write_md_control_flow_section(self, w: Callable[[str], None]) -> None:
+        """Generate Markdown control flow section."""
+        w(_MD_CONTROL_FLOW_HEADER)
+        for stage in self._stages_in_order:
+            w(f"#### Stage {stage.order}: {stage.name}\n\n")
+            w(f"- **Type:** {stage.stage_type}\n")
             if stage.description:
-                lines.append(f"- **Description:** {stage.description}")
+                w(f"- **Description:** {stage.description}\n")
             if stage.condition:
-                lines.append(f"- **Condition:** `{stage.condition}`")
+                w(f"- **Condition:** `{stage.condition}`\n")
 
             if stage.tasks:
-                lines.append(f"\n**Tasks:**\n")
+                w(f"\n**Tasks:**\n\n")
                 for task in stage.tasks:
-                    lines.append(f"- **{task.get('name', 'Unknown')}** ({task.get('type', 'Unknown')})")
-                    if task.get('description'):
-                        lines.append(f"  - {task.get('description')}")
-                    if task.get('sql_statement'):
-                        sql = task.get('sql_statement', '').strip()[:200]
-                        lines.append(f"  - SQL: `{sql}...`")
-            lines.append("")
-
-        # Data Flow
-        lines.append("## Data Flow Transformations\n")
+                    description, sql = task.description, task.sql_statement
+                    w(f"- **{task.name}** ({task.task_type})\n")
+                    if description:
+                        w(f"  - {description}\n")
+                    if sql:
+                        sql = sql_preview(sql, 200, one_line=False)
+                        w(f"  - SQL: `{sql}...`\n")
+            w("\n")
+
+    def _write_md_data_flow_section(self, w: Callable[[str], None]) -> None:
+        """Generate Markdown data flow section."""
+        w("## Data Flow Transformations\n\n")
         for dft in self.package.data_flow_tasks:
-            lines.append(f"### {dft.name}\n")
+            w(f"### {dft.name}\n\n")
             if dft.description:
-                lines.append(f"*{dft.description}*\n")
+                w(f"*{dft.description}*\n\n")
 
-            lines.append("#### Components\n")
-            lines.append("| Component | Type | Class | Description |")
-            lines.append("|-----------|------|-------|-------------|")
+            w(_MD_COMPONENTS_HEADER)
             for comp in dft.components:
-                desc = comp.description or ''
-                desc = desc[:50] + '...' if len(desc) > 50 else desc
-                lines.append(f"| {comp.name} | {comp.component_type} | {comp.component_class.split('.')[-1]} | {desc} |")
-            lines.append("")
+                desc = _truncate(comp.description or '', 50)
+                w(f"| {comp.name} | {comp.component_type} | {comp.short_class} | {desc} |\n")
+            w("\n")
 
             # Transformations detail
-            lines.append("#### Transformation Details\n")
-            for comp in dft.components:
-                if comp.component_type == 'Transform':
-                    lines.append(f"**{comp.name}** ({comp.component_class.split('.')[-1]})\n")
-
-                    if comp.output_columns:
-                        lines.append("Derived/Output Columns:\n")
-                        for col in comp.output_columns:
-                            if col.expression:
-                                lines.append(f"- `{col.name}`: `{col.expression}`")
-                            else:
-                                lines.append(f"- `{col.name}`")
-                        lines.append("")
-
-                    if comp.conditional_outputs:
-                        lines.append("Routing Conditions:\n")
-                        for cond in comp.conditional_outputs:
-                            if cond.is_default:
-                                lines.append(f"- `{cond.name}`: Default (unmatched rows)")
-                            else:
-                                lines.append(f"- `{cond.name}`: `{cond.expression or cond.friendly_expression}`")
-                        lines.append("")
-
-            lines.append("")
-
-        # Error Handling
-        lines.append("## Error Handling Strategy\n")
-        if self.package.error_handling:
-            lines.append(f"**Logging Mode:** {self.package.error_handling.logging_mode or 'Default'}\n")
-
-            if self.package.error_handling.logged_events:
-                lines.append("**Logged Events:**\n")
-                for event in self.package.error_handling.logged_events:
-                    lines.append(f"- {event}")
-                lines.append("")
-
-            if self.package.error_handling.event_handlers:
-                lines.append("### Event Handlers\n")
-                for handler in self.package.error_handling.event_handlers:
-                    lines.append(f"#### {handler.event_name}\n")
-                    for task in handler.executables:
-                        lines.append(f"- **{task.get('name', 'Unknown')}**: {task.get('description', 'N/A')}")
-                    lines.append("")
-
-        # Database Objects
-        lines.append("## Database Objects\n")
-        lines.append("### Tables\n")
-        lines.append("| Schema | Name | Usage |")
-        lines.append("|--------|------|-------|")
-        for obj in self.package.database_objects:
-            if obj.object_type == 'Table':
-                lines.append(f"| {obj.schema} | {obj.name} | {obj.usage} |")
-        lines.append("")
-
-        sp_objects = [o for o in self.package.database_objects if o.object_type == 'StoredProcedure']
+            w("#### Transformation Details\n\n")
+            for comp in self.diagram_gen.components_by_type(dft).get('Transform', []):
+                w(f"**{comp.name}** ({comp.short_class})\n\n")
+
+                if comp.output_columns:
+                    w("Derived/Output Columns:\n\n")
+                    for col in comp.output_columns:
+                        if col.expression:
+                            w(f"- `{col.name}`: `{col.expression}`\n")
+                        else:
+                            w(f"- `{col.name}`\n")
+                    w("\n")
+
+                if comp.conditional_outputs:
+                    w("Routing Conditions:\n\n")
+                    for cond in comp.conditional_outputs:
+                        if cond.is_default:
+                            w(f"- `{cond.name}`: Default (unmatched rows)\n")
+                        else:
+                            w(f"- `{cond.name}`: `{cond.expression or cond.friendly_expression}`\n")
+                    w("\n")
+
+            w("\n")
+
+    def _write_md_error_handling_section(self, w: Callable[[str], None]) -> None:
+        """Generate Markdown error handling section."""
+        error_handling = self.package.error_handling
+        w("## Error Handling Strategy\n\n")
+        if error_handling:
+            w(f"**Logging Mode:** {error_handling.logging_mode or 'Default'}\n\n")
+
+            if error_handling.logged_events:
+                w("**Logged Events:**\n\n")
+                w(''.join(
+                    f"- {event}\n"
+                    for event in error_handling.logged_events
+                ))
+                w("\n")
+
+            if error_handling.event_handlers:
+                w("### Event Handlers\n\n")
+                for handler in error_handling.event_handlers:
+                    w(f"#### {handler.event_name}\n\n")
+                    w(''.join(
+                        f"- **{task.name}**: {task.description}\n"
+                        for task in handler.executables
+                    ))
+                    w("\n")
+
+    def _write_md_database_objects_section(self, w: Callable[[str], None]) -> None:
+        """Generate Markdown database objects section."""
+        objects_by_type = self._database_objects_by_type
+        w(_MD_TABLES_HEADER)
+        w(''.join(
+            f"| {obj.schema} | {obj.name} | {obj.usage} |\n"
+            for obj in objects_by_type.get('Table', [])
+        ))
+        w("\n")
+
+        sp_objects = objects_by_type.get('StoredProcedure', [])
         if sp_objects:
-            lines.append("### Stored Procedures\n")
-            lines.append("| Schema | Name | Usage |")
-            lines.append("|--------|------|-------|")
-            for obj in sp_objects:
-                lines.append(f"| {obj.schema} | {obj.name} | {obj.usage} |")
-            lines.append("")
-
-        func_objects = [o for o in self.package.database_objects if o.object_type == 'Function']
+            w(_MD_PROCEDURES_HEADER)
+            w(''.join(
+                f"| {obj.schema} | {obj.name} | {obj.usage} |\n"
+                for obj in sp_objects
+            ))
+            w("\n")
+
+        func_objects = objects_by_type.get('Function', [])
         if func_objects:
-            lines.append("### Functions\n")
-            lines.append("| Schema | Name | Usage |")
-            lines.append("|--------|------|-------|")
-            for obj in func_objects:
-                lines.append(f"| {obj.schema} | {obj.name} | {obj.usage} |")
-            lines.append("")
-
-        # Diagrams
-        lines.append("## Data Flow Diagrams\n")
-        diagrams = self.diagram_gen.generate_all_diagrams()
-        for diagram in diagrams:
-            lines.append(f"### {diagram.name}\n")
-            lines.append("```mermaid")
-            lines.append(diagram.mermaid_code)
-            lines.append("```\n")
-
-            lines.append("<details>")
-            lines.append("<summary>ASCII Diagram</summary>\n")
-            lines.append("```")
-            lines.append(diagram.ascii_diagram)
-            lines.append("```")
-            lines.append("</details>\n")
+            w(_MD_FUNCTIONS_HEADER)
+            w(''.join(
+                f"| {obj.schema} | {obj.name} | {obj.usage} |\n"
+                for obj in func_objects
+            ))
+            w("\n")
+
+    def _write_md_diagrams_section(self, w: Callable[[str], None]) -> None:
+        """Generate Markdown diagrams section."""
+        w("## Data Flow Diagrams\n\n")
+        for diagram in self.diagram_gen.iter_diagrams():
+            w(f"### {diagram.name}\n\n")
+            w("```mermaid\n")
+            w(diagram.mermaid_code + '\n')
+            w("```\n\n")
+
+            w(_MD_ASCII_DETAILS_OPEN)
+            w(diagram.ascii_diagram + '\n')
+            w(_MD_ASCII_DETAILS_CLOSE)
 
         # Execution Order
-        lines.append("### Execution Order Diagram\n")
-        lines.append("```")
-        lines.append(self.diagram_gen.generate_execution_order_diagram())
-        lines.append("```\n")
+        w(_MD_EXECUTION_ORDER_HEADER)
+        w(self._execution_order_diagram + '\n')
+        w("```\n\n")
 
         # Routing Logic
-        lines.append("### Data Routing Logic\n")
-        lines.append("```")
-        lines.append(self.diagram_gen.generate_routing_logic_diagram())
-        lines.append("```\n")
-
-        # Thresholds and Alerts
-        lines.append("## Critical Thresholds and Alerts\n")
-        lines.append("### Thresholds\n")
-        lines.append("| Name | Value | Category | Data Type |")
-        lines.append("|------|-------|----------|-----------|")
-        for threshold in self.package.thresholds:
-            lines.append(f"| {threshold.name} | {threshold.value} | {threshold.category} | {threshold.data_type} |")
-        lines.append("")
+        w(_MD_ROUTING_HEADER)
+        w(self._routing_logic_diagram + '\n')
+        w("```\n\n")
+
+    def _write_md_thresholds_alerts_section(self, w: Callable[[str], None]) -> None:
+        """Generate Markdown thresholds and alerts section."""
+        w(_MD_THRESHOLDS_HEADER)
+        w(''.join(
+            f"| {threshold.name} | {threshold.value} | {threshold.category} | {threshold.data_type} |\n"
+            for threshold in self.package.thresholds
+        ))
+        w("\n")
 
         if self.package.alerts:
-            lines.append("### Alerts\n")
-            lines.append("| Name | Type | Category | Priority | Recipients |")
-            lines.append("|------|------|----------|----------|------------|")
+            w(_MD_ALERTS_HEADER)
             for alert in self.package.alerts:
-                recipients = alert.recipients[:30] + '...' if alert.recipients and len(alert.recipients) > 30 else (alert.recipients or 'N/A')
-                lines.append(f"| {alert.name} | {alert.alert_type} | {alert.category} | {alert.priority} | {recipients} |")
+                recipients = _truncate(alert.recipients, 30) if alert.recipients else 'N/A'
+                w(f"| {alert.name} | {alert.alert_type} | {alert.category} | {alert.priority} | {recipients} |\n")
 
-        return '\n'.join(lines)
-
-    def _generate_header(self) -> str:
+    def _write_header(self, w: Callable[[str], None]) -> None:
         """Generate report header."""
         width = 80
-        lines = []
-        lines.append("=" * width)
-        lines.append(" DTSX PACKAGE ANALYSIS REPORT ".center(width))
-        lines.append("=" * width)
-        lines.append(f" Package: {self.package.metadata.name}".ljust(width))
-        lines.append(f" Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}".ljust(width))
-        lines.append("=" * width)
-        return '\n'.join(lines)
-
-    def _generate_package_configuration(self) -> str:
+        w(_BAR_80)
+        w(" DTSX PACKAGE ANALYSIS REPORT ".center(width) + '\n')
+        w(_BAR_80)
+        w(f" Package: {self.package.metadata.name}".ljust(width) + '\n')
+        w(f" Generated: {datetime.now().strftime(_TIMESTAMP_FORMAT)}".ljust(width) + '\n')
+        w(_BAR_80)
+
+    def _write_package_configuration(self, w: Callable[[str], None]) -> None:
         """Generate package configuration section."""
-        lines = []
-        lines.append("=" * 80)
-        lines.append(" 1. PACKAGE CONFIGURATION")
-        lines.append("=" * 80)
+        metadata = self.package.metadata
+        w(_BAR_80)
+        w(" 1. PACKAGE CONFIGURATION\n")
+        w(_BAR_80)
 
         # Metadata
-        lines.append("\n1.1 METADATA")
-        lines.append("-" * 40)
-        lines.append(f"  Package Name:        {self.package.metadata.name}")
-        lines.append(f"  DTSID:               {self.package.metadata.dtsid}")
-        lines.append(f"  Creation Date:       {self.package.metadata.creation_date or 'N/A'}")
-        lines.append(f"  Creator:             {self.package.metadata.creator_name or 'N/A'}")
-        lines.append(f"  Creator Computer:    {self.package.metadata.creator_computer or 'N/A'}")
-        lines.append(f"  Version Build:       {self.package.metadata.version_build or 'N/A'}")
-        lines.append(f"  Package Format:      {self.package.metadata.package_format_version or 'N/A'}")
-        lines.append(f"  Last Modified Ver:   {self.package.metadata.last_modified_version or 'N/A'}")
+        w("\n1.1 METADATA\n")
+        w(_DASH_40)
+        w(f"  Package Name:        {metadata.name}\n")
+        w(f"  DTSID:               {metadata.dtsid}\n")
+        w(f"  Creation Date:       {metadata.creation_date or 'N/A'}\n")
+        w(f"  Creator:             {metadata.creator_name or 'N/A'}\n")
+        w(f"  Creator Computer:    {metadata.creator_computer or 'N/A'}\n")
+        w(f"  Version Build:       {metadata.version_build or 'N/A'}\n")
+        w(f"  Package Format:      {metadata.package_format_version or 'N/A'}\n")
+        w(f"  Last Modified Ver:   {metadata.last_modified_version or 'N/A'}\n")
 
         # Connection Managers
-        lines.append("\n1.2 CONNECTION MANAGERS")
-        lines.append("-" * 40)
+        w("\n1.2 CONNECTION MANAGERS\n")
+        w(_DASH_40)
         for i, conn in enumerate(self.package.connection_managers, 1):
-            lines.append(f"\n  [{i}] {conn.name}")
-            lines.append(f"      Type:       {conn.connection_type}")
-            lines.append(f"      Server:     {conn.server or 'N/A'}")
-            lines.append(f"      Database:   {conn.database or 'N/A'}")
-            lines.append(f"      Provider:   {conn.provider or 'N/A'}")
+            w(f"\n  [{i}] {conn.name}\n")
+            w(f"      Type:       {conn.connection_type}\n")
+            w(f"      Server:     {conn.server or 'N/A'}\n")
+            w(f"      Database:   {conn.database or 'N/A'}\n")
+            w(f"      Provider:   {conn.provider or 'N/A'}\n")
 
         # Variables
-        lines.append("\n1.3 PACKAGE VARIABLES")
-        lines.append("-" * 40)
-        lines.append(f"  {'Name':<30} {'Namespace':<10} {'Type':<6} {'Value':<30}")
-        lines.append(f"  {'-'*30} {'-'*10} {'-'*6} {'-'*30}")
+        w("\n1.3 PACKAGE VARIABLES\n")
+        w(_DASH_40)
+        w(_TEXT_VARIABLES_COLUMNS)
         for var in self.package.variables:
-            value = str(var.value)[:30] if var.value else 'N/A'
-            lines.append(f"  {var.name:<30} {var.namespace:<10} {var.data_type:<6} {value:<30}")
+            value = _value_or_na(var.value, 30)
+            w(f"  {var.name:<30} {var.namespace:<10} {var.data_type:<6} {value:<30}\n")
 
         # Parameters
         if self.package.parameters:
-            lines.append("\n1.4 PACKAGE PARAMETERS")
-            lines.append("-" * 40)
-            lines.append(f"  {'Name':<25} {'Type':<6} {'Sensitive':<10} {'Value':<30}")
-            lines.append(f"  {'-'*25} {'-'*6} {'-'*10} {'-'*30}")
+            w("\n1.4 PACKAGE PARAMETERS\n")
+            w(_DASH_40)
+            w(_TEXT_PARAMETERS_COLUMNS)
             for param in self.package.parameters:
                 sens = "Yes" if param.sensitive else "No"
-                value = str(param.value)[:30] if param.value else 'N/A'
-                lines.append(f"  {param.name:<25} {param.data_type:<6} {sens:<10} {value:<30}")
-
-        return '\n'.join(lines)
+                value = _value_or_na(param.value, 30)
+                w(f"  {param.name:<25} {param.data_type:<6} {sens:<10} {value:<30}\n")
 
-    def _generate_control_flow_section(self) -> str:
+    def _write_control_flow_section(self, w: Callable[[str], None]) -> None:
         """Generate control flow section."""
-        lines = []
-        lines.append("=" * 80)
-        lines.append(" 2. CONTROL FLOW STAGES (EXECUTION ORDER)")
-        lines.append("=" * 80)
-
-        for stage in self.package.control_flow_stages:
-            lines.append(f"\n{'='*60}")
-            lines.append(f"STAGE {stage.order}: {stage.name}")
-            lines.append(f"{'='*60}")
-            lines.append(f"  Type:        {stage.stage_type}")
+        w(_BAR_80)
+        w(" 2. CONTROL FLOW STAGES (EXECUTION ORDER)\n")
+        w(_BAR_80)
+
+        for stage in self._stages_in_order:
+            w('\n' + _BAR_60)
+            w(f"STAGE {stage.order}: {stage.name}\n")
+            w(_BAR_60)
+            w(f"  Type:        {stage.stage_type}\n")
             if stage.description:
-                lines.append(f"  Description: {stage.description}")
+                w(f"  Description: {stage.description}\n")
             if stage.condition:
-                lines.append(f"  Condition:   {stage.condition}")
+                w(f"  Condition:   {stage.condition}\n")
 
             if stage.precedence_from:
-                lines.append(f"  Executes After: {', '.join(self._extract_names(stage.precedence_from))}")
+                w(f"  Executes After: {', '.join(self._extract_names(stage.precedence_from))}\n")
 
             if stage.tasks:
-                lines.append(f"\n  TASKS ({len(stage.tasks)} total):")
-                lines.append(f"  {'-'*50}")
+                w(f"\n  TASKS ({len(stage.tasks)} total):\n")
+                w('  ' + _DASH_50)
                 for i, task in enumerate(stage.tasks, 1):
-                    lines.append(f"\n    [{i}] {task.get('name', 'Unknown')}")
-                    lines.append(f"        Type: {task.get('type', 'Unknown')}")
-                    if task.get('description'):
-                        lines.append(f"        Desc: {task.get('description')}")
-                    if task.get('sql_statement'):
-                        sql = task.get('sql_statement', '').strip()
-                        sql_preview = sql[:100].replace('\n', ' ')
-                        lines.append(f"        SQL:  {sql_preview}...")
-                    if task.get('to_address'):
-                        lines.append(f"        To:   {task.get('to_address')}")
-
-        return '\n'.join(lines)
-
-    def _generate_data_flow_section(self) -> str:
+                    description, sql, to_address = task.description, task.sql_statement, task.to_address
+                    w(f"\n    [{i}] {task.name}\n        Type: {task.task_type}\n")
+                    if description:
+                        w(f"        Desc: {description}\n")
+                    if sql:
+                        w(f"        SQL:  {sql_preview(sql, 100)}...\n")
+                    if to_address:
+                        w(f"        To:   {to_address}\n")
+
+    def _write_data_flow_section(self, w: Callable[[str], None]) -> None:
         """Generate data flow section."""
-        lines = []
-        lines.append("=" * 80)
-        lines.append(" 3. DATA FLOW TRANSFORMATIONS AND ROUTING LOGIC")
-        lines.append("=" * 80)
+        w(_BAR_80)
+        w(" 3. DATA FLOW TRANSFORMATIONS AND ROUTING LOGIC\n")
+        w(_BAR_80)
 
         for dft in self.package.data_flow_tasks:
-            lines.append(f"\n{'='*70}")
-            lines.append(f"DATA FLOW TASK: {dft.name}")
-            lines.append(f"{'='*70}")
+            w('\n' + _BAR_70)
+            w(f"DATA FLOW TASK: {dft.name}\n")
+            w(_BAR_70)
             if dft.description:
-                lines.append(f"Description: {dft.description}")
+                w(f"Description: {dft.description}\n")
 
             # Components summary
-            sources = [c for c in dft.components if c.component_type == 'Source']
-            transforms = [c for c in dft.components if c.component_type == 'Transform']
-            destinations = [c for c in dft.components if c.component_type == 'Destination']
+            by_type = self.diagram_gen.components_by_type(dft)
+            sources = by_type.get('Source', [])
+            transforms = by_type.get('Transform', [])
+            destinations = by_type.get('Destination', [])
 
-            lines.append(f"\nComponent Summary:")
-            lines.append(f"  Sources:        {len(sources)}")
-            lines.append(f"  Transforms:     {len(transforms)}")
-            lines.append(f"  Destinations:   {len(destinations)}")
+            w(f"\nComponent Summary:\n")
+            w(f"  Sources:        {len(sources)}\n")
+            w(f"  Transforms:     {len(transforms)}\n")
+            w(f"  Destinations:   {len(destinations)}\n")
 
             # Sources
             if sources:
-                lines.append(f"\n3.1 SOURCES")
-                lines.append(f"{'-'*50}")
+                w(f"\n3.1 SOURCES\n")
+                w(_DASH_50)
                 for src in sources:
-                    lines.append(f"\n  [{src.name}]")
-                    lines.append(f"    Class: {src.component_class}")
+                    w(f"\n  [{src.name}]\n")
+                    w(f"    Class: {src.component_class}\n")
                     if src.connection_manager:
-                        lines.append(f"    Connection: {src.connection_manager}")
+                        w(f"    Connection: {src.connection_manager}\n")
                     if src.sql_command:
-                        sql = src.sql_command.strip()[:200].replace('\n', ' ')
-                        lines.append(f"    SQL: {sql}...")
+                        sql = sql_preview(src.sql_command, 200)
+                        w(f"    SQL: {sql}...\n")
 
             # Transformations
             if transforms:
-                lines.append(f"\n3.2 TRANSFORMATIONS")
-                lines.append(f"{'-'*50}")
+                w(f"\n3.2 TRANSFORMATIONS\n")
+                w(_DASH_50)
                 for trn in transforms:
-                    lines.append(f"\n  [{trn.name}]")
-                    lines.append(f"    Class: {trn.component_class}")
+                    w(f"\n  [{trn.name}]\n")
+                    w(f"    Class: {trn.component_class}\n")
                     if trn.description:
-                        lines.append(f"    Description: {trn.description}")
+                        w(f"    Description: {trn.description}\n")
 
                     # Output columns with expressions
                     if trn.output_columns:
-                        lines.append(f"    Derived Columns:")
+                        w(f"    Derived Columns:\n")
                         for col in trn.output_columns:
                             if col.expression:
                                 expr = col.expression[:60]
-                                lines.append(f"      - {col.name}: {expr}")
+                                w(f"      - {col.name}: {expr}\n")
 
                     # Conditional outputs (routing)
                     if trn.conditional_outputs:
-                        lines.append(f"    Routing Logic:")
+                        w(f"    Routing Logic:\n")
                         for cond in trn.conditional_outputs:
                             if cond.is_default:
-                                lines.append(f"      - {cond.name}: DEFAULT (unmatched rows)")
+                                w(f"      - {cond.name}: DEFAULT (unmatched rows)\n")
                             else:
                                 expr = cond.friendly_expression or cond.expression
-                                lines.append(f"      - {cond.name}: {expr}")
+                                w(f"      - {cond.name}: {expr}\n")
 
             # Destinations
             if destinations:
-                lines.append(f"\n3.3 DESTINATIONS")
-                lines.append(f"{'-'*50}")
+                w(f"\n3.3 DESTINATIONS\n")
+                w(_DASH_50)
                 for dst in destinations:
-                    lines.append(f"\n  [{dst.name}]")
-                    lines.append(f"    Class: {dst.component_class}")
+                    w(f"\n  [{dst.name}]\n")
+                    w(f"    Class: {dst.component_class}\n")
                     if dst.table_name:
-                        lines.append(f"    Table: {dst.table_name}")
+                        w(f"    Table: {dst.table_name}\n")
                     if dst.connection_manager:
-                        lines.append(f"    Connection: {dst.connection_manager}")
+                        w(f"    Connection: {dst.connection_manager}\n")
                     if dst.has_error_output:
-                        lines.append(f"    Has Error Output: Yes")
+                        w(f"    Has Error Output: Yes\n")
 
             # Data paths
-            lines.append(f"\n3.4 DATA PATHS")
-            lines.append(f"{'-'*50}")
+            w(f"\n3.4 DATA PATHS\n")
+            w(_DASH_50)
             for path in dft.paths:
-                lines.append(f"  {path.name}")
-                lines.append(f"    From: {self._extract_component_short(path.source_ref_id)}")
-                lines.append(f"    To:   {self._extract_component_short(path.destination_ref_id)}")
+                w(f"  {path.name}\n")
+                w(f"    From: {self._extract_component_short(path.source_ref_id)}\n")
+                w(f"    To:   {self._extract_component_short(path.destination_ref_id)}\n")
 
-        return '\n'.join(lines)
-
-    def _generate_error_handling_section(self) -> str:
+    def _write_error_handling_section(self, w: Callable[[str], None]) -> None:
         """Generate error handling section."""
-        lines = []
-        lines.append("=" * 80)
-        lines.append(" 4. ERROR HANDLING STRATEGY")
-        lines.append("=" * 80)
+        w(_BAR_80)
+        w(" 4. ERROR HANDLING STRATEGY\n")
+        w(_BAR_80)
 
         if self.package.error_handling:
             eh = self.package.error_handling
 
-            lines.append(f"\n4.1 LOGGING CONFIGURATION")
-            lines.append(f"{'-'*50}")
-            lines.append(f"  Logging Mode: {eh.logging_mode or 'Default'}")
-            lines.append(f"  Fail on Failure: {'Yes' if eh.fail_package_on_failure else 'No'}")
-            lines.append(f"  Max Error Count: {eh.max_error_count}")
+            w(f"\n4.1 LOGGING CONFIGURATION\n")
+            w(_DASH_50)
+            w(f"  Logging Mode: {eh.logging_mode or 'Default'}\n")
+            w(f"  Fail on Failure: {'Yes' if eh.fail_package_on_failure else 'No'}\n")
+            w(f"  Max Error Count: {eh.max_error_count}\n")
 
             if eh.logged_events:
-                lines.append(f"\n  Logged Events:")
-                for event in eh.logged_events:
-                    lines.append(f"    - {event}")
+                w(f"\n  Logged Events:\n")
+                w(''.join(
+                    f"    - {event}\n"
+                    for event in eh.logged_events
+                ))
 
             if eh.event_handlers:
-                lines.append(f"\n4.2 EVENT HANDLERS")
-                lines.append(f"{'-'*50}")
+                w(f"\n4.2 EVENT HANDLERS\n")
+                w(_DASH_50)
                 for handler in eh.event_handlers:
-                    lines.append(f"\n  [{handler.event_name}]")
-                    lines.append(f"    Tasks:")
+                    w(f"\n  [{handler.event_name}]\n")
+                    w(f"    Tasks:\n")
                     for task in handler.executables:
-                        lines.append(f"      - {task.get('name', 'Unknown')}")
-                        if task.get('description'):
-                            lines.append(f"        {task.get('description')}")
-                        if task.get('to_address'):
-                            lines.append(f"        Recipients: {task.get('to_address')}")
-
-        return '\n'.join(lines)
+                        w(f"      - {task.name}\n")
+                        if task.description:
+                            w(f"        {task.description}\n")
+                        if task.to_address:
+                            w(f"        Recipients: {task.to_address}\n")
 
-    def _generate_database_objects_section(self) -> str:
+    def _write_database_objects_section(self, w: Callable[[str], None]) -> None:
         """Generate database objects section."""
-        lines = []
-        lines.append("=" * 80)
-        lines.append(" 5. DATABASE OBJECTS")
-        lines.append("=" * 80)
+        w(_BAR_80)
+        w(" 5. DATABASE OBJECTS\n")
+        w(_BAR_80)
 
         # Group by type
-        tables = [o for o in self.package.database_objects if o.object_type == 'Table']
-        procedures = [o for o in self.package.database_objects if o.object_type == 'StoredProcedure']
-        functions = [o for o in self.package.database_objects if o.object_type == 'Function']
+        by_type = self._database_objects_by_type
+        tables = by_type.get('Table', [])
+        procedures = by_type.get('StoredProcedure', [])
+        functions = by_type.get('Function', [])
 
         # Tables
-        lines.append(f"\n5.1 TABLES ({len(tables)} found)")
-        lines.append(f"{'-'*50}")
-        lines.append(f"  {'Schema':<15} {'Name':<35} {'Usage':<15}")
-        lines.append(f"  {'-'*15} {'-'*35} {'-'*15}")
-        for obj in tables:
-            lines.append(f"  {obj.schema:<15} {obj.name:<35} {obj.usage:<15}")
+        w(f"\n5.1 TABLES ({len(tables)} found)\n")
+        w(_DASH_50)
+        w(_TEXT_OBJECTS_COLUMNS)
+        w(''.join(
+            f"  {obj.schema:<15} {obj.name:<35} {obj.usage:<15}\n"
+            for obj in tables
+        ))
 
         # Stored Procedures
         if procedures:
-            lines.append(f"\n5.2 STORED PROCEDURES ({len(procedures)} found)")
-            lines.append(f"{'-'*50}")
-            lines.append(f"  {'Schema':<15} {'Name':<35} {'Usage':<15}")
-            lines.append(f"  {'-'*15} {'-'*35} {'-'*15}")
-            for obj in procedures:
-                lines.append(f"  {obj.schema:<15} {obj.name:<35} {obj.usage:<15}")
+            w(f"\n5.2 STORED PROCEDURES ({len(procedures)} found)\n")
+            w(_DASH_50)
+            w(_TEXT_OBJECTS_COLUMNS)
+            w(''.join(
+                f"  {obj.schema:<15} {obj.name:<35} {obj.usage:<15}\n"
+                for obj in procedures
+            ))
 
         # Functions
         if functions:
-            lines.append(f"\n5.3 FUNCTIONS ({len(functions)} found)")
-            lines.append(f"{'-'*50}")
-            lines.append(f"  {'Schema':<15} {'Name':<35} {'Usage':<15}")
-            lines.append(f"  {'-'*15} {'-'*35} {'-'*15}")
-            for obj in functions:
-                lines.append(f"  {obj.schema:<15} {obj.name:<35} {obj.usage:<15}")
-
-        return '\n'.join(lines)
-
-    def _generate_diagrams_section(self) -> str:
+            w(f"\n5.3 FUNCTIONS ({len(functions)} found)\n")
+            w(_DASH_50)
+            w(_TEXT_OBJECTS_COLUMNS)
+            w(''.join(
+                f"  {obj.schema:<15} {obj.name:<35} {obj.usage:<15}\n"
+                for obj in functions
+            ))
+
+    def _write_diagrams_section(self, w: Callable[[str], None]) -> None:
         """Generate diagrams section."""
-        lines = []
-        lines.append("=" * 80)
-        lines.append(" 6. DATA FLOW DIAGRAMS")
-        lines.append("=" * 80)
+        w(_BAR_80)
+        w(" 6. DATA FLOW DIAGRAMS\n")
+        w(_BAR_80)
 
         # Control flow diagram
-        lines.append(self.diagram_gen._generate_ascii_control_flow())
+        w(self.diagram_gen._generate_ascii_control_flow() + '\n')
 
         # Data flow diagrams
         for dft in self.package.data_flow_tasks:
-            lines.append(self.diagram_gen._generate_ascii_data_flow(dft))
+            w(self.diagram_gen._generate_ascii_data_flow(dft) + '\n')
 
         # Execution order
-        lines.append(self.diagram_gen.generate_execution_order_diagram())
+        w(self._execution_order_diagram + '\n')
 
         # Routing logic
-        lines.append(self.diagram_gen.generate_routing_logic_diagram())
-
-        return '\n'.join(lines)
+        w(self._routing_logic_diagram + '\n')
 
-    def _generate_thresholds_alerts_section(self) -> str:
+    def _write_thresholds_alerts_section(self, w: Callable[[str], None]) -> None:
         """Generate thresholds and alerts section."""
-        lines = []
-        lines.append("=" * 80)
-        lines.append(" 7. CRITICAL THRESHOLDS AND ALERTS")
-        lines.append("=" * 80)
+        w(_BAR_80)
+        w(" 7. CRITICAL THRESHOLDS AND ALERTS\n")
+        w(_BAR_80)
 
         # Thresholds
-        lines.append(f"\n7.1 THRESHOLDS ({len(self.package.thresholds)} found)")
-        lines.append(f"{'-'*60}")
-        lines.append(f"  {'Name':<30} {'Value':<15} {'Category':<15}")
-        lines.append(f"  {'-'*30} {'-'*15} {'-'*15}")
+        w(f"\n7.1 THRESHOLDS ({len(self.package.thresholds)} found)\n")
+        w(_DASH_60)
+        w(_TEXT_THRESHOLDS_COLUMNS)
         for threshold in self.package.thresholds:
-            value = str(threshold.value)[:15] if threshold.value else 'N/A'
-            lines.append(f"  {threshold.name:<30} {value:<15} {threshold.category:<15}")
+            value = _value_or_na(threshold.value, 15)
+            w(f"  {threshold.name:<30} {value:<15} {threshold.category:<15}\n")
 
         # Alerts
         if self.package.alerts:
-            lines.append(f"\n7.2 ALERTS ({len(self.package.alerts)} found)")
-            lines.append(f"{'-'*60}")
-            lines.append(f"  {'Name':<30} {'Type':<15} {'Priority':<10} {'Category':<10}")
-            lines.append(f"  {'-'*30} {'-'*15} {'-'*10} {'-'*10}")
+            w(f"\n7.2 ALERTS ({len(self.package.alerts)} found)\n")
+            w(_DASH_60)
+            w(_TEXT_ALERTS_COLUMNS)
             for alert in self.package.alerts:
-                lines.append(f"  {alert.name:<30} {alert.alert_type:<15} {alert.priority:<10} {alert.category:<10}")
+                w(f"  {alert.name:<30} {alert.alert_type:<15} {alert.priority:<10} {alert.category:<10}\n")
                 if alert.recipients:
-                    lines.append(f"    Recipients: {alert.recipients}")
+                    w(f"    Recipients: {alert.recipients}\n")
 
-        return '\n'.join(lines)
-
-    def _generate_json_report(self) -> str:
+    def _generate_json_report(self, pretty: bool = False) -> str:
         """Generate JSON report."""
-        data = {
-            'metadata': {
-                'name': self.package.metadata.name,
-                'dtsid': self.package.metadata.dtsid,
-                'creation_date': self.package.metadata.creation_date,
-                'creator_name': self.package.metadata.creator_name,
-                'version_build': self.package.metadata.version_build,
-                'package_format_version': self.package.metadata.package_format_version
-            },
-            'connection_managers': [
-                {
-                    'name': c.name,
-                    'type': c.connection_type,
-                    'server': c.server,
-                    'database': c.database
-                }
-                for c in self.package.connection_managers
-            ],
-            'variables': [
-                {
-                    'name': v.name,
-                    'namespace': v.namespace,
-                    'data_type': v.data_type,
-                    'value': v.value
-                }
-                for v in self.package.variables
-            ],
-            'parameters': [
-                {
-                    'name': p.name,
-                    'data_type': p.data_type,
-                    'value': p.value,
-                    'sensitive': p.sensitive
-                }
-                for p in self.package.parameters
-            ],
-            'control_flow_stages': [
-                {
-                    'order': s.order,
-                    'name': s.name,
-                    'type': s.stage_type,
-                    'description': s.description,
-                    'condition': s.condition,
-                    'tasks': s.tasks
-                }
-                for s in self.package.control_flow_stages
-            ],
-            'data_flow_tasks': [
-                {
-                    'name': dft.name,
-                    'description': dft.description,
-                    'components': [
-                        {
-                            'name': c.name,
-                            'type': c.component_type,
-                            'class': c.component_class,
-                            'sql_command': c.sql_command,
-                            'table_name': c.table_name,
-                            'output_columns': [
-                                {'name': col.name, 'expression': col.expression}
-                                for col in c.output_columns
-                            ],
-                            'conditional_outputs': [
-                                {
-                                    'name': co.name,
-                                    'expression': co.expression,
-                                    'is_default': co.is_default
-                                }
-                                for co in c.conditional_outputs
-                            ]
-                        }
-                        for c in dft.components
-                    ],
-                    'paths': [
-                        {
-                            'name': p.name,
-                            'source': p.source_ref_id,
-                            'destination': p.destination_ref_id
-                        }
-                        for p in dft.paths
-                    ]
-                }
-                for dft in self.package.data_flow_tasks
-            ],
-            'error_handling': {
-                'logging_mode': self.package.error_handling.logging_mode if self.package.error_handling else None,
-                'logged_events': self.package.error_handling.logged_events if self.package.error_handling else [],
-                'event_handlers': [
-                    {
-                        'event_name': h.event_name,
-                        'tasks': h.executables
-                    }
-                    for h in self.package.error_handling.event_handlers
-                ] if self.package.error_handling else []
-            },
-            'database_objects': [
-                {
-                    'name': o.name,
-                    'type': o.object_type,
-                    'schema': o.schema,
-                    'usage': o.usage
-                }
-                for o in self.package.database_objects
-            ],
-            'thresholds': [
-                {
-                    'name': t.name,
-                    'value': t.value,
-                    'category': t.category,
-                    'data_type': t.data_type
-                }
-                for t in self.package.thresholds
-            ],
-            'alerts': [
-                {
-                    'name': a.name,
-                    'type': a.alert_type,
-                    'category': a.category,
-                    'priority': a.priority,
-                    'recipients': a.recipients
-                }
-                for a in self.package.alerts
-            ]
-        }
-
-        return json.dumps(data, indent=2, default=str)
+        data = _json_data(self.package)
+        if pretty:
+            return json.dumps(data, indent=2, default=str)
+        # Without indent, dumps takes the C encoder
+        return json.dumps(data, separators=(',', ':'), default=str)
 
     def _extract_names(self, refs: list) -> list:
         """Extract clean names from ref IDs."""
-        names = []
-        for ref in refs:
-            parts = ref.split('\\')
-            names.append(parts[-1] if parts else ref)
-        return names
+        return [ref.rpartition('\\')[2] for ref in refs]
 
     def _extract_component_short(self, ref_id: str) -> str:
         """Extract short component name from ref ID."""
-        parts = ref_id.split('\\')
-        if len(parts) > 1:
-            return parts[-1].split('.')[0]
-        return ref_id
+        _, sep, tail = ref_id.rpartition('\\')
+        return tail.partition('.')[0] if sep else ref_id
 
-    def save_report(self, output_path: str, output_format: str = 'text') -> None:
+    def save_report(self, output_path: str, output_format: str = 'text',
+                    pretty: bool = False) -> None:
         """Save report to file."""
-        report = self.generate_full_report(output_format)
-
-        ext_map = {
-            'text': '.txt',
-            'markdown': '.md',
-            'json': '.json'
-        }
-
         path = Path(output_path)
         if path.suffix == '':
-            path = path.with_suffix(ext_map.get(output_format, '.txt'))
-
-        path.write_text(report, encoding='utf-8')
+            path = path.with_suffix(_REPORT_EXTENSIONS.get(output_format, '.txt'))
+
+        # Write next to the target and swap it in, so a failure never leaves
+        # a truncated report behind
+        tmp_path = path.with_name(f".{path.name}.tmp")
+        try:
+            with tmp_path.open('w', encoding='utf-8') as f:
+                self.write_full_report(f, output_format, pretty)
+            os.replace(tmp_path, path)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
         print(f"Report saved to: {path}")
 
-    def save_all_formats(self, output_dir: str) -> None:
+    def save_all_formats(self, output_dir: str, pretty: bool = False) -> None:
         """Save reports in all formats."""
         output_path = Path(output_dir)
         output_path.mkdir(parents=True, exist_ok=True)
 
         base_name = self.package.metadata.name.replace(' ', '_')
 
-        for fmt in ['text', 'markdown', 'json']:
-            ext = {'text': '.txt', 'markdown': '.md', 'json': '.json'}[fmt]
+        for fmt, ext in _REPORT_EXTENSIONS.items():
             file_path = output_path / f"{base_name}_report{ext}"
-            self.save_report(str(file_path), fmt)
+            self.save_report(str(file_path), fmt, pretty)
@@ -9,176 +9,213 @@ This script demonstrates how to use the dtsx_parser package to:
 4. Create data flow diagrams
 """
 
-from dtsx_parser import DtsxParser, ReportGenerator, DiagramGenerator
+import sys
+from itertools import islice
+from pathlib import Path
 
+from dtsx_parser import DtsxParser, ReportGenerator, DiagramGenerator
 
-def main():
-    """Demonstrate DTSX parser usage."""
+# Report files written by main: (file name, report format, description)
+_REPORT_FILES = (
+    ('output_report.txt', 'text', 'Text report'),
+    ('output_report.md', 'markdown', 'Markdown report'),
+    ('output_report.json', 'json', 'JSON report'),
+)
 
-    # Path to the DTSX file
-    dtsx_file = 'CreditCardTransactionProcessing.dtsx'
 
-    print("=" * 70)
-    print(" DTSX Parser Example Usage")
-    print("=" * 70)
-    print()
-
-    # 1. Parse the package
-    print("1. Parsing DTSX package...")
-    parser = DtsxParser(dtsx_file)
-    package = parser.parse()
-    print(f"   Package Name: {package.metadata.name}")
-    print(f"   Created: {package.metadata.creation_date}")
-    print()
+def _summary_lines(package) -> list:
+    """Build the console summary of a parsed package (sections 1-8)."""
+    lines = []
+    lines.append(f"   Package Name: {package.metadata.name}")
+    lines.append(f"   Created: {package.metadata.creation_date}")
+    lines.append('')
 
     # 2. Access package components
-    print("2. Package Components:")
-    print(f"   - Connection Managers: {len(package.connection_managers)}")
+    lines.append("2. Package Components:")
+    lines.append(f"   - Connection Managers: {len(package.connection_managers)}")
     for conn in package.connection_managers:
-        print(f"     * {conn.name} ({conn.connection_type})")
-    print()
+        lines.append(f"     * {conn.name} ({conn.connection_type})")
+    lines.append('')
 
-    print(f"   - Variables: {len(package.variables)}")
-    for var in package.variables[:5]:  # Show first 5
-        print(f"     * {var.namespace}::{var.name} = {var.value}")
+    lines.append(f"   - Variables: {len(package.variables)}")
+    for var in islice(package.variables, 5):  # Show first 5
+        lines.append(f"     * {var.namespace}::{var.name} = {var.value}")
     if len(package.variables) > 5:
-        print(f"     ... and {len(package.variables) - 5} more")
-    print()
+        lines.append(f"     ... and {len(package.variables) - 5} more")
+    lines.append('')
 
-    print(f"   - Parameters: {len(package.parameters)}")
+    lines.append(f"   - Parameters: {len(package.parameters)}")
     for param in package.parameters:
-        print(f"     * {param.name} = {param.value}")
-    print()
+        lines.append(f"     * {param.name} = {param.value}")
+    lines.append('')
 
     # 3. Control Flow Stages
-    print("3. Control Flow Stages (Execution Order):")
+    lines.append("3. Control Flow Stages (Execution Order):")
     for stage in package.control_flow_stages:
         condition = f" [IF: {stage.condition}]" if stage.condition else ""
-        print(f"   Stage {stage.order}: {stage.name} ({stage.stage_type}){condition}")
-        for task in stage.tasks[:3]:  # Show first 3 tasks
-            print(f"     - {task.get('name', 'Unknown')}")
+        lines.append(f"   Stage {stage.order}: {stage.name} ({stage.stage_type}){condition}")
+        for task in islice(stage.tasks, 3):  # Show first 3 tasks
+            lines.append(f"     - {task.name}")
         if len(stage.tasks) > 3:
-            print(f"     ... and {len(stage.tasks) - 3} more tasks")
-    print()
+            lines.append(f"     ... and {len(stage.tasks) - 3} more tasks")
+    lines.append('')
 
     # 4. Data Flow Tasks
-    print("4. Data Flow Tasks:")
+    lines.append("4. Data Flow Tasks:")
     for dft in package.data_flow_tasks:
-        print(f"   {dft.name}:")
-        sources = [c for c in dft.components if c.component_type == 'Source']
-        transforms = [c for c in dft.components if c.component_type == 'Transform']
-        destinations = [c for c in dft.components if c.component_type == 'Destination']
+        lines.append(f"   {dft.name}:")
+        by_type = dft.components_by_type()
+        sources = by_type.get('Source', [])
+        transforms = by_type.get('Transform', [])
+        destinations = by_type.get('Destination', [])
 
-        print(f"     Sources ({len(sources)}):")
+        lines.append(f"     Sources ({len(sources)}):")
         for src in sources:
-            print(f"       - {src.name}")
+            lines.append(f"       - {src.name}")
 
-        print(f"     Transforms ({len(transforms)}):")
+        lines.append(f"     Transforms ({len(transforms)}):")
         for trn in transforms:
-            class_name = trn.component_class.split('.')[-1]
-            print(f"       - {trn.name} [{class_name}]")
+            lines.append(f"       - {trn.name} [{trn.short_class}]")
             if trn.conditional_outputs:
                 for co in trn.conditional_outputs:
                     expr = co.expression or "(Default)"
-                    print(f"         -> Route: {co.name}: {expr[:40]}")
+                    lines.append(f"         -> Route: {co.name}: {expr[:40]}")
 
-        print(f"     Destinations ({len(destinations)}):")
+        lines.append(f"     Destinations ({len(destinations)}):")
         for dst in destinations:
             table = dst.table_name or "N/A"
-            print(f"       - {dst.name} -> {table}")
-    print()
+            lines.append(f"       - {dst.name} -> {table}")
+    lines.append('')
 
     # 5. Database Objects
-    print("5. Database Objects:")
-    tables = [o for o in package.database_objects if o.object_type == 'Table']
-    procs = [o for o in package.database_objects if o.object_type == 'StoredProcedure']
-    funcs = [o for o in package.database_objects if o.object_type == 'Function']
-
-    print(f"   Tables ({len(tables)}):")
-    for t in tables[:5]:
-        print(f"     - {t.schema}.{t.name} [{t.usage}]")
+    lines.append("5. Database Objects:")
+    objects_by_type = package.database_objects_by_type()
+    tables = objects_by_type.get('Table', [])
+    procs = objects_by_type.get('StoredProcedure', [])
+    funcs = objects_by_type.get('Function', [])
+
+    lines.append(f"   Tables ({len(tables)}):")
+    for t in islice(tables, 5):
+        lines.append(f"     - {t.schema}.{t.name} [{t.usage}]")
     if len(tables) > 5:
-        print(f"     ... and {len(tables) - 5} more")
+        lines.append(f"     ... and {len(tables) - 5} more")
 
     if procs:
-        print(f"   Stored Procedures ({len(procs)}):")
+        lines.append(f"   Stored Procedures ({len(procs)}):")
         for p in procs:
-            print(f"     - {p.schema}.{p.name}")
+            lines.append(f"     - {p.schema}.{p.name}")
 
     if funcs:
-        print(f"   Functions ({len(funcs)}):")
+        lines.append(f"   Functions ({len(funcs)}):")
         for f in funcs:
-            print(f"     - {f.schema}.{f.name}")
-    print()
+            lines.append(f"     - {f.schema}.{f.name}")
+    lines.append('')
 
     # 6. Error Handling
-    print("6. Error Handling Strategy:")
+    lines.append("6. Error Handling Strategy:")
     if package.error_handling:
-        print(f"   Logging Mode: {package.error_handling.logging_mode}")
-        print(f"   Logged Events: {', '.join(package.error_handling.logged_events)}")
-        print(f"   Event Handlers:")
+        lines.append(f"   Logging Mode: {package.error_handling.logging_mode}")
+        lines.append(f"   Logged Events: {', '.join(package.error_handling.logged_events)}")
+        lines.append(f"   Event Handlers:")
         for handler in package.error_handling.event_handlers:
-            print(f"     - {handler.event_name}: {len(handler.executables)} tasks")
-    print()
+            lines.append(f"     - {handler.event_name}: {len(handler.executables)} tasks")
+    lines.append('')
 
     # 7. Thresholds
-    print("7. Critical Thresholds:")
+    lines.append("7. Critical Thresholds:")
     for t in package.thresholds:
-        print(f"   - {t.name}: {t.value} [{t.category}]")
-    print()
+        lines.append(f"   - {t.name}: {t.value} [{t.category}]")
+    lines.append('')
 
     # 8. Alerts
-    print("8. Alerts Configuration:")
+    lines.append("8. Alerts Configuration:")
     for alert in package.alerts:
-        print(f"   - {alert.name} ({alert.alert_type}) - {alert.priority}")
-    print()
+        lines.append(f"   - {alert.name} ({alert.alert_type}) - {alert.priority}")
+    lines.append('')
+    return lines
+
+
+def _closing_lines(diagram_gen: DiagramGenerator, output_dir: Path) -> list:
+    """Build the execution order, routing logic and closing banner."""
+    # Print execution order
+    lines = []
+    lines.append('')
+    lines.append("=" * 70)
+    lines.append(" EXECUTION ORDER DIAGRAM")
+    lines.append("=" * 70)
+    lines.append(diagram_gen.generate_execution_order_diagram())
+
+    # Print routing logic
+    lines.append('')
+    lines.append("=" * 70)
+    lines.append(" DATA ROUTING LOGIC")
+    lines.append("=" * 70)
+    lines.append(diagram_gen.generate_routing_logic_diagram())
+
+    lines.append('')
+    lines.append("=" * 70)
+    lines.append(" DONE!")
+    lines.append("=" * 70)
+    lines.append('')
+    lines.append("Generated files:")
+    for file_name, _, description in _REPORT_FILES:
+        lines.append(f"  - {str(output_dir / file_name):<20} ({description})")
+    lines.append(f"  - {str(output_dir / 'diagram_*.mmd'):<20} (Mermaid diagram files)")
+    return lines
+
+
+def main(dtsx_file: str = 'CreditCardTransactionProcessing.dtsx', *,
+         quiet: bool = False, out_dir: str = '.') -> None:
+    """Demonstrate DTSX parser usage.
+
+    Reports and diagrams are written to ``out_dir``; ``quiet`` skips all
+    console output so the example can be run over many packages in a loop.
+    """
+    output_dir = Path(out_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    if not quiet:
+        print("=" * 70)
+        print(" DTSX Parser Example Usage")
+        print("=" * 70)
+        print()
+        print("1. Parsing DTSX package...")
+
+    # 1. Parse the package
+    parser = DtsxParser(dtsx_file)
+    package = parser.parse()
+    if not quiet:
+        print('\n'.join(_summary_lines(package)))
 
     # 9. Generate Reports
-    print("9. Generating Reports...")
+    if not quiet:
+        print("9. Generating Reports...")
     report_gen = ReportGenerator(package)
 
     # Save in all formats
-    report_gen.save_report('output_report.txt', 'text')
-    report_gen.save_report('output_report.md', 'markdown')
-    report_gen.save_report('output_report.json', 'json')
-    print()
+    for file_name, fmt, _ in _REPORT_FILES:
+        path = output_dir / file_name
+        with path.open('w', encoding='utf-8') as f:
+            report_gen.write_full_report(f, fmt)
+        if not quiet:
+            print(f"Report saved to: {path}")
 
     # 10. Generate Diagrams
-    print("10. Generating Diagrams...")
+    if not quiet:
+        print()
+        print("10. Generating Diagrams...")
     diagram_gen = DiagramGenerator(package)
-    diagrams = diagram_gen.generate_all_diagrams()
 
-    for diagram in diagrams:
-        print(f"    Generated: {diagram.name}")
+    for diagram in diagram_gen.iter_diagrams():
+        if not quiet:
+            print(f"    Generated: {diagram.name}")
         # Save Mermaid code
-        with open(f"diagram_{diagram.name.replace(' ', '_')}.mmd", 'w') as f:
-            f.write(diagram.mermaid_code)
-
-    # Print execution order
-    print()
-    print("=" * 70)
-    print(" EXECUTION ORDER DIAGRAM")
-    print("=" * 70)
-    print(diagram_gen.generate_execution_order_diagram())
+        safe_name = diagram.name.replace(' ', '_')
+        (output_dir / f"diagram_{safe_name}.mmd").write_bytes(diagram.mermaid_code.encode('utf-8'))
 
-    # Print routing logic
-    print()
-    print("=" * 70)
-    print(" DATA ROUTING LOGIC")
-    print("=" * 70)
-    print(diagram_gen.generate_routing_logic_diagram())
-
-    print()
-    print("=" * 70)
-    print(" DONE!")
-    print("=" * 70)
-    print()
-    print("Generated files:")
-    print("  - output_report.txt    (Text report)")
-    print("  - output_report.md     (Markdown report)")
-    print("  - output_report.json   (JSON report)")
-    print("  - diagram_*.mmd        (Mermaid diagram files)")
+    if not quiet:
+        print('\n'.join(_closing_lines(diagram_gen, output_dir)))
 
 
 if __name__ == '__main__':
-    main()
+    main(sys.argv[1] if len(sys.argv) > 1 else 'CreditCardTransactionProcessing.dtsx')
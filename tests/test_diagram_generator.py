@@ -0,0 +1,32 @@
+"""Tests for DiagramGenerator caching."""
+
+import unittest
+
+from dtsx_parser import DiagramGenerator, DtsxPackage, PackageMetadata, DataFlowTask, DataFlowComponent
+
+
+class DuplicateRefIdTest(unittest.TestCase):
+    """Data flow tasks whose ref_id is empty must not share cached results."""
+
+    def setUp(self):
+        first = DataFlowTask('DFT1', '', '', components=[
+            DataFlowComponent('Src', '', 'Source', 'Microsoft.OLEDBSource')])
+        second = DataFlowTask('DFT2', '', '', components=[
+            DataFlowComponent('Dst', '', 'Destination', 'Microsoft.OLEDBDestination')])
+        package = DtsxPackage(metadata=PackageMetadata(name='Pkg', dtsid=''),
+                              data_flow_tasks=[first, second])
+        self.generator = DiagramGenerator(package)
+        self.tasks = package.data_flow_tasks
+
+    def test_one_diagram_per_task(self):
+        names = [diagram.name for diagram in self.generator.generate_all_diagrams()]
+        self.assertEqual(names, ['Control Flow', 'DFT1', 'DFT2'])
+
+    def test_components_grouped_per_task(self):
+        first, second = self.tasks
+        self.assertEqual(list(self.generator.components_by_type(first)), ['Source'])
+        self.assertEqual(list(self.generator.components_by_type(second)), ['Destination'])
+
+
+if __name__ == '__main__':
+    unittest.main()
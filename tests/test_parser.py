@@ -0,0 +1,112 @@
+"""Regression tests for DtsxParser against the bundled sample package."""
+
+import copy
+import tempfile
+import unittest
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+from dtsx_parser import DtsxParser
+from dtsx_parser.parser import _find_sql_references
+
+SAMPLE_PACKAGE = Path(__file__).resolve().parent.parent / 'CreditCardTransactionProcessing.dtsx'
+
+
+class SamplePackageTest(unittest.TestCase):
+    """Parse CreditCardTransactionProcessing.dtsx once and check what it yields."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.package = DtsxParser(str(SAMPLE_PACKAGE)).parse()
+
+    def test_single_data_flow_task(self):
+        names = [dft.name for dft in self.package.data_flow_tasks]
+        self.assertEqual(names, ['DFT_ExtractAndValidate'])
+
+    def test_components_counted_once(self):
+        # The pipeline is found directly under the task, not once per nested match
+        dft = self.package.data_flow_tasks[0]
+        counts = {kind: len(comps) for kind, comps in dft.components_by_type().items()}
+        self.assertEqual(counts, {'Source': 1, 'Transform': 6, 'Destination': 3})
+
+    def test_database_objects_extracted(self):
+        objects = self.package.database_objects
+        self.assertTrue(objects)
+        self.assertTrue(all(obj.name for obj in objects))
+
+    def test_alerts_extracted(self):
+        self.assertTrue(self.package.alerts)
+
+
+class ParallelParseTest(unittest.TestCase):
+    """Parsing in a process pool must give the same package as the serial path."""
+
+    @classmethod
+    def setUpClass(cls):
+        # The pool only takes packages with more than one data flow task,
+        # so write a copy of the sample with its data flow task duplicated
+        tree = ET.parse(SAMPLE_PACKAGE)
+        dts = '{www.microsoft.com/SqlServer/Dts}'
+        for parent in tree.iter(dts + 'Executables'):
+            for elem in parent:
+                if elem.get(dts + 'ExecutableType') == 'Microsoft.Pipeline':
+                    twin = copy.deepcopy(elem)
+                    twin.set(dts + 'ObjectName', elem.get(dts + 'ObjectName') + '_Copy')
+                    twin.set(dts + 'refId', elem.get(dts + 'refId') + '_Copy')
+                    parent.append(twin)
+                    break
+        cls.tmp = tempfile.TemporaryDirectory()
+        cls.path = str(Path(cls.tmp.name) / 'two_pipelines.dtsx')
+        tree.write(cls.path, encoding='utf-8', xml_declaration=True)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp.cleanup()
+
+    def test_parallel_matches_serial(self):
+        serial = DtsxParser(self.path).parse()
+        parser = DtsxParser(self.path, max_workers=2)
+        # Force both pooled paths on this small package
+        parser.PARALLEL_MIN_COMPONENTS = 0
+        parser.PARALLEL_MIN_STATEMENTS = 0
+        parser.SQL_BATCH_SIZE = 1
+        parallel = parser.parse()
+        self.assertEqual(len(parallel.data_flow_tasks), 2)
+        self.assertEqual(parallel, serial)
+
+
+class SqlReferenceTest(unittest.TestCase):
+    """Pin what _find_sql_references extracts from SQL text."""
+
+    def references(self, sql):
+        return _find_sql_references([(sql, 'Task')])
+
+    def test_bracketed_table(self):
+        self.assertEqual(self.references('SELECT * FROM [dbo].[Transactions] t'),
+                         [('[dbo].[Transactions]', 'Table', 'Task')])
+
+    def test_three_part_table(self):
+        self.assertEqual(self.references('INSERT INTO Staging.dbo.Transactions VALUES (1)'),
+                         [('Staging.dbo.Transactions', 'Table', 'Task')])
+
+    def test_table_valued_function(self):
+        self.assertEqual(self.references('SELECT * FROM dbo.fn_GetLimits(@id)'),
+                         [('dbo.fn_GetLimits', 'Table', 'Task'),
+                          ('dbo.fn_GetLimits', 'Function', 'Reference')])
+
+    def test_bracketed_three_part_table_valued_function(self):
+        self.assertEqual(self.references('SELECT * FROM [db].[dbo].[fn_x](1)'),
+                         [('[db].[dbo]', 'Table', 'Task'),
+                          ('[dbo].[fn_x]', 'Function', 'Reference')])
+
+    def test_function_in_expression(self):
+        self.assertEqual(self.references('SELECT [dbo].[fn_Score](Amount) AS Score'),
+                         [('[dbo].[fn_Score]', 'Function', 'Reference')])
+
+    def test_procedure(self):
+        self.assertEqual(self.references('EXEC [dbo].[usp_LogError] ?, ?'),
+                         [('[dbo].[usp_LogError]', 'StoredProcedure', 'Execute')])
+
+
+if __name__ == '__main__':
+    unittest.main()